@@ -1,217 +1,134 @@
 import logging
-from datetime import datetime, timedelta
-import json
-import requests
-from zoneinfo import ZoneInfo
 from homeassistant.util import dt as dt_util
-from .const import DOMAIN, VARIABLES, HASHES, REQUIRED, TZ
+from .rbfa_core.client import RESPONSE_CACHE, RbfaClient
+from .rbfa_core.normalize import normalize
+from .rbfa_core.standings import SeriesStandings
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class TeamApp(object):
+    """Fetches the RBFA data of a team in layers and normalises it.
+
+    Team info, calendar, match details and rankings are fetched
+    separately and kept as raw payloads, so each layer can be refreshed
+    on its own cadence. process() rebuilds the normalised match data
+    from whatever is cached, without network traffic. The update methods
+    raise RbfaConnectionError when a request fails.
+    """
 
     def __init__(self, hass, my_api):
         self.hass = hass
+        self.api = my_api
         self.team = my_api.data['team']
-
-    def __get_url(self, operation, value, language='nl'):
-        try:
-            main_url = 'https://datalake-prod2018.rbfa.be/graphql'
-            url = '{}?operationName={}&variables={{"{}":"{}","language":"{}"}}&extensions={{"persistedQuery":{{"version":1,"sha256Hash":"{}"}}}}'.format(
-                main_url,
-                operation,
-                VARIABLES[operation],
-                value,
-                language,
-                HASHES[operation]
-            )
-            response = self.s.get(url)
-            if response.status_code != 200:
-                _LOGGER.debug('Invalid response from server for collection data')
-                return
-
-            rj = response.json()
-            if rj.get('data') is None:
-                _LOGGER.debug("Error for operation {}: {}".format(operation, rj['errors'][0]['message']))
-
-            elif rj['data'][REQUIRED[operation]] == None:
-                _LOGGER.debug('no results')
-
-            else:
-                return rj
-
-        except requests.exceptions.RequestException as exc:
-            _LOGGER.error('Error occurred while fetching data: %r', exc)
-
-    def __get_team(self):
-        response = self.__get_url('GetTeam', self.team)
-        return response
-
-    def __get_data(self):
-        response = self.__get_url('GetTeamCalendar', self.team)
-        return response
-
-    def __get_match(self):
-        response = self.__get_url('GetMatchDetail', self.match)
-        return response
-
-    def __get_ranking(self):
-        response = self.__get_url('GetSeriesRankings', self.series)
-        return response
-
-
-    async def update(self, my_api):
-        with requests.Session() as self.s:
-            _LOGGER.debug('Updating match details using Rest API')
-
-            _LOGGER_LEVEL = logging.getLogger(__name__).getEffectiveLevel()
-            _LOGGER_DEFAULT = logging.getLogger("default").getEffectiveLevel()
-
-            if _LOGGER_LEVEL == 10:
-                logging.getLogger("urllib3").setLevel(logging.DEBUG)
-            else:
-                logging.getLogger("urllib3").setLevel(_LOGGER_DEFAULT)
-
-            if 'duration' in my_api.options:
-                self.duration = my_api.options['duration']
-            else:
-                self.duration = my_api.data['duration']
-
-            if 'show_ranking' in my_api.options:
-                self.show_ranking = my_api.options['show_ranking']
-            elif 'show_ranking' in my_api.data:
-                self.show_ranking = my_api.data['show_ranking']
-            else:
-                self.show_ranking = True
-
-            if 'show_referee' in my_api.options:
-                self.show_referee = my_api.options['show_referee']
-            elif 'show_referee' in my_api.data:
-                self.show_referee = my_api.data['show_referee']
-            else:
-                self.show_referee = True
-
-            self.collections = [];
-            _LOGGER.debug('duration: %r', self.duration)
-            _LOGGER.debug('show ranking: %r', self.show_ranking)
-
-            now = dt_util.utcnow()
-
-            r = await self.hass.async_add_executor_job(self.__get_team)
-            if r != None:
-                self.teamdata = r['data']['team']
-
-            r = await self.hass.async_add_executor_job(self.__get_data)
-            if r != None:
-                upcoming = False
-                previous = None
-
-                self.collections = []
-                referee = None
-
-                for item in r['data']['teamCalendar']:
-                    self.match = item['id']
-                    r = await self.hass.async_add_executor_job(self.__get_match)
-                    if r != None:
-                        match = r['data']['matchDetail']['location']
-                        location='{}\n{} {}\nBelgium'.format(
-                            match['address'],
-                            match['postalCode'],
-                            match['city'],
-                        )
-                        if self.show_referee:
-                            officials = r['data']['matchDetail']['officials']
-                            for x in officials:
-                                if x['function'] == 'referee':
-                                    referee = f"{x['firstName']} {x['lastName']}"
-                    else:
-                        location = None
-
-                    naive_dt  = datetime.strptime(item['startTime'], '%Y-%m-%dT%H:%M:%S')
-                    starttime = naive_dt.replace(tzinfo = ZoneInfo(TZ))
-                    endtime = starttime + timedelta(minutes=self.duration)
-
-                    matchdata = {
-                        'matchid': item['id'],
-                        'team': self.team,
-                        'channel': item['channel'],
-                        'starttime': starttime,
-                        'endtime': endtime,
-                        'location': location,
-                        'referee': referee,
-                        'hometeam': item['homeTeam']['name'],
-                        'hometeamid': item['homeTeam']['id'],
-                        'hometeamlogo': item['homeTeam']['logo'],
-                        'hometeamgoals': item['outcome']['homeTeamGoals'],
-                        'hometeampenalties': item['outcome']['homeTeamPenaltiesScored'],
-                        'hometeamposition': None,
-                        'awayteam': item['awayTeam']['name'],
-                        'awayteamid': item['awayTeam']['id'],
-                        'awayteamlogo': item['awayTeam']['logo'],
-                        'awayteamgoals': item['outcome']['awayTeamGoals'],
-                        'awayteampenalties': item['outcome']['awayTeamPenaltiesScored'],
-                        'awayteamposition': None,
-                        'series': item['series']['name'],
-                        'seriesid': item['series']['id'],
-                        'ranking': [],
-                    }
-
-                    if endtime >= now and not upcoming:
-
-                        upcoming = True
-                        self.matchdata = {
-                            'upcoming': matchdata,
-                            'lastmatch': previous
-                        }
-                        if self.show_ranking:
-                            await self.get_ranking('upcoming')
-                            if previous != None:
-                                await self.get_ranking('lastmatch')
-
-                    summary = item['homeTeam']['name'] + ' - ' + item['awayTeam']['name']
-                    description = item['series']['name'] + ' (state: ' + item['state'] + ')'
-
-                    if self.show_ranking:
-                        result = 'No match score'
-                        if item['outcome']['homeTeamGoals'] != None:
-                            result = 'Goals: ' + str(item['outcome']['homeTeamGoals']) + ' - ' + str(item['outcome']['awayTeamGoals'])
-                        if item['outcome']['homeTeamPenaltiesScored'] != None:
-                            result += '; Penalties: ' + str(item['outcome']['homeTeamPenaltiesScored']) + ' - '
-                            result += str(item['outcome']['awayTeamPenaltiesScored'])
-                        description += "; " + result
-
-                    collection = {
-                        'uid': item['id'],
-                        'starttime': starttime,
-                        'endtime': endtime,
-                        'summary': summary,
-                        'location': location,
-                        'description': description,
-                    }
-
-                    self.collections.append(collection)
-                    previous = matchdata
-
-                if not upcoming:
-                    _LOGGER.debug('previous=last')
-                    self.matchdata = {
-                        'upcoming': None,
-                        'lastmatch': previous
-                    }
-                    if self.show_ranking:
-                        await self.get_ranking('lastmatch')
-
-    async def get_ranking (self, tag):
+        self.teamdata = None
+        self.calendar = []
+        self.details = {}
+        self.series_rankings = {}
+        self.standings = {}
+        self.collections = []
+        self.matches = {}
+        self.rankings = {}
+        self.matchdata = {'upcoming': None, 'lastmatch': None}
+        self.client = RbfaClient(run_job=hass.async_add_executor_job)
+
+    def __debug_urllib3(self):
+        _LOGGER_LEVEL = logging.getLogger(__name__).getEffectiveLevel()
+        _LOGGER_DEFAULT = logging.getLogger("default").getEffectiveLevel()
+
+        if _LOGGER_LEVEL == 10:
+            logging.getLogger("urllib3").setLevel(logging.DEBUG)
+        else:
+            logging.getLogger("urllib3").setLevel(_LOGGER_DEFAULT)
+
+    def __option(self, key, default):
+        if key in self.api.options:
+            return self.api.options[key]
+        return self.api.data.get(key, default)
+
+    async def update_team(self):
+        """Fetch the team info."""
+        _LOGGER.debug('Updating team info using Rest API')
+        self.__debug_urllib3()
+        teamdata = await self.client.get_team(self.team)
+        if teamdata != None:
+            self.teamdata = teamdata
+        return self.teamdata
+
+    async def update_calendar(self):
+        """Fetch the calendar and drop the details of matches no longer in it."""
+        _LOGGER.debug('Updating calendar using Rest API')
+        self.__debug_urllib3()
+        calendar = await self.client.get_calendar(self.team)
+        if calendar != None:
+            self.calendar = calendar
+            ids = {item['id'] for item in self.calendar}
+            self.details = {k: v for k, v in self.details.items() if k in ids}
+            for seriesid, standings in self.standings.items():
+                if standings.update(self.calendar, seriesid, dt_util.utcnow(), self.__option('duration', 105)):
+                    _LOGGER.debug('provisional standings for series %s', seriesid)
+        self.process()
+        RESPONSE_CACHE.log_stats()
+
+    def missing_details(self):
+        return [item['id'] for item in self.calendar if item['id'] not in self.details]
+
+    async def update_details(self, missing_only=False):
+        """Fetch the details of all matches, or of the ones not fetched yet."""
+        _LOGGER.debug('Updating match details using Rest API')
+        self.__debug_urllib3()
+        ids = self.missing_details() if missing_only else [item['id'] for item in self.calendar]
+        for match in ids:
+            detail = await self.client.get_match(match)
+            if detail != None:
+                self.details[match] = detail
+        self.process()
+
+    def ranking_series(self):
+        """Return the series whose ranking is shown."""
+        if not self.__option('show_ranking', True):
+            return set()
+        return {
+            data['seriesid']
+            for data in self.matchdata.values()
+            if data is not None
+        }
+
+    async def update_rankings(self):
+        """Fetch the official rankings of the series of the next and last match.
+
+        Results that arrive later are applied to the standings by
+        update_calendar until the next official ranking.
+        """
         _LOGGER.debug('show ranking')
-
-        self.series = self.matchdata[tag]['seriesid']
-        r = await self.hass.async_add_executor_job(self.__get_ranking)
-        if r != None:
-            for rank in r['data']['seriesRankings']['rankings'][0]['teams']:
-                rankteam = {'position': rank['position'], 'team': rank['name'], 'id': rank['teamId']}
-                self.matchdata[tag]['ranking'].append(rankteam)
-                if rank['teamId'] == self.matchdata[tag]['hometeamid']:
-                    self.matchdata[tag]['hometeamposition'] = rank['position']
-                if rank['teamId'] == self.matchdata[tag]['awayteamid']:
-                    self.matchdata[tag]['awayteamposition'] = rank['position']
+        if not self.__option('show_ranking', True):
+            return
+        self.__debug_urllib3()
+        series = self.ranking_series()
+        for seriesid in series:
+            teams = await self.client.get_ranking(seriesid)
+            if teams != None:
+                self.series_rankings[seriesid] = teams
+        self.series_rankings = {k: v for k, v in self.series_rankings.items() if k in series}
+        self.standings = {}
+        for seriesid, teams in self.series_rankings.items():
+            self.standings[seriesid] = SeriesStandings(teams, self.team)
+            self.standings[seriesid].update(self.calendar, seriesid, dt_util.utcnow(), self.__option('duration', 105))
+        self.process()
+
+    def process(self, now=None):
+        """Build matches, calendar collections and next/last match from the cached payloads."""
+        result = normalize(
+            self.team,
+            self.calendar,
+            self.details,
+            self.standings,
+            now or dt_util.utcnow(),
+            duration=self.__option('duration', 105),
+            show_ranking=self.__option('show_ranking', True),
+            show_referee=self.__option('show_referee', True),
+        )
+        self.collections = result['collections']
+        self.matches = result['matches']
+        self.rankings = result['rankings']
+        self.matchdata = result['matchdata']
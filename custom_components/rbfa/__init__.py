@@ -6,26 +6,45 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 
 from .const import DOMAIN
-from .API import TeamApp
-from .coordinator import MyCoordinator
+from .coordinator import RbfaData
+from .services import async_setup_services
+from . import websocket_api
+from .logos import RbfaLogoView, async_get_logo_cache
+from .directory import async_get_directory
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.CALENDAR, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass, config) -> bool:
+    """Set up the RBFA actions, websocket commands, logo view and team directory."""
+    await async_get_directory(hass)
+    async_setup_services(hass)
+    websocket_api.async_setup(hass)
+    hass.http.register_view(RbfaLogoView(await async_get_logo_cache(hass)))
+    return True
+
 async def async_setup_entry(hass, entry) -> bool:
     """Set up RBFA from a config entry."""
-    coordinator = MyCoordinator(hass, entry)
+    rbfa = RbfaData(hass, entry)
     _LOGGER.debug('first refresh')
-    await coordinator.async_config_entry_first_refresh()
+    await rbfa.async_config_entry_first_refresh()
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = rbfa
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
+async def async_update_options(hass, entry) -> None:
+    """Apply changed options to the cached data, without fetching."""
+    hass.data[DOMAIN][entry.entry_id].async_apply_options()
+
 async def async_unload_entry(hass, entry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -33,6 +52,8 @@ async def async_unload_entry(hass, entry) -> bool:
     _LOGGER.debug('remove data')
 
     # Pop add-on data
-    hass.data.pop(entry.entry_id, None)
+    rbfa = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if rbfa is not None:
+        await rbfa.async_shutdown()
 
     return unload_ok
@@ -8,7 +8,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 
 from .const       import DOMAIN
-from .coordinator import MyCoordinator
+from .coordinator import RbfaData
 from .entity      import RbfaEntity
 
 
@@ -21,11 +21,11 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up RBFA sensor based on a config entry."""
-    coordinator: MyCoordinator = hass.data[DOMAIN][entry.entry_id]
+    rbfa: RbfaData = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
         [TeamCalendar(
-            coordinator,
+            rbfa,
             entry,
         )]
     )
@@ -34,15 +34,16 @@ class TeamCalendar(RbfaEntity, CalendarEntity):
     """Defines a RBFA Team Calendar."""
 
     _attr_icon = "mdi:soccer"
+    _layers = ('team', 'details')
 
     def __init__(
         self,
-        coordinator,
+        rbfa,
         config,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(rbfa)
         """Initialize the RBFA Team entity."""
-        self.TeamData = coordinator
+        self.TeamData = rbfa
         self.config = config
         team = config.data['team']
         _LOGGER.debug('team: %r', team)
@@ -59,11 +60,11 @@ class TeamCalendar(RbfaEntity, CalendarEntity):
             self._attr_name = self.config.options['alt_name']
         elif 'alt_name' in self.config.data:
             self._attr_name = self.config.data['alt_name']
-        else:
+        elif self.TeamData.teamdata:
             self._attr_name = f"{self.TeamData.teamdata['clubName']} | {self.TeamData.teamdata['name']}"
 
-        upcoming = self.TeamData.data['upcoming']
-        lastmatch = self.TeamData.data['lastmatch']
+        upcoming = self.TeamData.matchdata['upcoming']
+        lastmatch = self.TeamData.matchdata['lastmatch']
 
         if upcoming != None:
 #             _LOGGER.debug('upcoming teamname: %r', upcoming['teamname'])
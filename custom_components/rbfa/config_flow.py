@@ -5,6 +5,7 @@ from homeassistant.helpers import selector
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import DOMAIN
+from .directory import CannotConnect, async_get_directory
 
 import logging
 import voluptuous as vol
@@ -17,22 +18,51 @@ class RbfaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 2
 
-    async def async_step_user(self, user_input):
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._user_input: dict[str, Any] = {}
+        self._teams: list[dict] = []
 
-        if user_input is not None:
-            team = user_input.get('team')
-            duration = user_input.get('duration')
-            show_ranking = user_input.get('show_ranking')
-            language = user_input.get('language')
-
-            await self.async_set_unique_id(f"{team}")
-            self._abort_if_unique_id_configured()
+    async def async_step_user(self, user_input=None):
 
-            return self.async_create_entry(title=f"{team}", data=user_input)
+        errors = {}
+        if user_input is not None:
+            team = (user_input.get('team') or '').strip()
+            if team:
+                user_input['team'] = team
+            search = (user_input.pop('search', None) or '').strip()
+            directory = await async_get_directory(self.hass)
+
+            try:
+                if team:
+                    if await directory.async_get_team(team) is None:
+                        errors['team'] = 'invalid_team'
+                    else:
+                        return await self._async_create_team_entry(user_input)
+
+                elif search:
+                    self._teams = []
+                    if search.isdigit():
+                        if await directory.async_get_club(search) is not None:
+                            self._teams = directory.club_teams(search)
+                    if not self._teams:
+                        self._teams = directory.search(search)
+
+                    if self._teams:
+                        self._user_input = user_input
+                        return await self.async_step_team()
+                    errors['search'] = 'no_results'
+
+                else:
+                    errors['base'] = 'missing_team'
+
+            except CannotConnect:
+                errors['base'] = 'cannot_connect'
 
         schema = vol.Schema(
             {
-                vol.Required('team'): str,
+                vol.Optional('team'): str,
+                vol.Optional('search'): str,
                 vol.Optional('alt_name'): str,
                 vol.Required('duration', default=105
                 ): selector.NumberSelector(
@@ -61,10 +91,46 @@ class RbfaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=schema,
-            errors={},
+            data_schema=self.add_suggested_values_to_schema(schema, user_input or {}),
+            errors=errors,
+        )
+
+    async def async_step_team(self, user_input=None):
+        """Pick a team from the directory search results."""
+
+        if user_input is not None:
+            return await self._async_create_team_entry({**self._user_input, 'team': user_input['team']})
+
+        options = [
+            selector.SelectOptionDict(
+                value=t['id'],
+                label=f"{t['club']} | {t['name']}" if t.get('club') else t['name'],
+            )
+            for t in self._teams
+        ]
+
+        return self.async_show_form(
+            step_id="team",
+            data_schema=vol.Schema(
+                {
+                    vol.Required('team'): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=options,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                }
+            ),
         )
 
+    async def _async_create_team_entry(self, user_input):
+        team = user_input['team']
+
+        await self.async_set_unique_id(f"{team}")
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(title=f"{team}", data=user_input)
+
     @staticmethod
     @callback
     def async_get_options_flow(
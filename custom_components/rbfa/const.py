@@ -1,4 +1,5 @@
 import json
+from datetime import timedelta
 from pathlib import Path
 
 
@@ -10,31 +11,19 @@ DOMAIN  = manifest_data.get("domain")
 NAME    = manifest_data.get("name")
 VERSION = manifest_data.get("version")
 
-TZ = 'Europe/Brussels'
+TEAM_INTERVAL = timedelta(hours=12)
+CALENDAR_INTERVAL = timedelta(minutes=15)
+DETAILS_INTERVAL = timedelta(hours=6)
+RANKING_INTERVAL = timedelta(hours=6)
+PROVISIONAL_REFRESH = timedelta(minutes=15)
+ROLLOVER_DELAY = timedelta(seconds=1)
 
-VARIABLES = {
-    'GetTeam':          'teamId',
-    'GetTeamCalendar':  'teamId',
-    'getClubInfo':      'clubId',
-    'GetUpcomingMatch': 'teamId',
-    'GetMatchDetail':   'matchId',
-    'GetSeriesRankings': 'seriesId',
-}
+DATA_DIRECTORY = f"{DOMAIN}_directory"
+DIRECTORY_TTL = timedelta(days=7)
 
-HASHES = {
-    'GetTeam':          '66888f01d376a6484c0c6824e5f266cb3c3513ab83964e50e0a7c30b8fddb4fa',
-    'GetTeamCalendar':  '3f0441e6723b9852b4f0cff2c872f4aa674c5de2d23589efc70c7a4ffb7f6383',
-    'getClubInfo':      '7c1bd99f0001a20d60208c60d4fb7c99aefdb810b9ee1c4de21a6d6ba4804b58',
-    'GetUpcomingMatch': '7e0aa25b6dbe45cede5f1a16320b091be9078a7b9d8cb9cb1402fc35292696fb',
-    'GetMatchDetail':   'cd8867b845c206fe7aa75c1ebf7b53cbda0ff030253a45e2e2b4bcc13ee46c9a',
-    'GetSeriesRankings': '7d13cbe2a17d6d5e7a3a0c1039d09c2e0ca326a454ec6fd2a471aa1fa2cf73e5',
-}
+DATA_LOGOS = f"{DOMAIN}_logos"
+LOGO_RETRY = timedelta(hours=1)
+THUMBNAIL_SIZE = 128
+LOGO_MAX_SIZE = 512 * 1024
 
-REQUIRED = {
-    'GetTeam':          'team',
-    'GetTeamCalendar':  'teamCalendar',
-    'getClubInfo':      'clubInfo',
-    'GetUpcomingMatch': 'upcomingMatch',
-    'GetMatchDetail':   'matchDetail',
-    'GetSeriesRankings': 'seriesRankings',
-}
+CHANNEL_LOGO = 'https://www.rbfa.be/assets/img/icons/organisers/Logo{}.svg'
@@ -1,36 +1,344 @@
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import DOMAIN, CHANNEL_LOGO, ROLLOVER_DELAY, PROVISIONAL_REFRESH, TEAM_INTERVAL, CALENDAR_INTERVAL, DETAILS_INTERVAL, RANKING_INTERVAL
 from .API import TeamApp
+from .rbfa_core.client import RbfaConnectionError
+from .directory import async_get_directory
+from .logos import async_get_logo_cache
 
 _LOGGER = logging.getLogger(__name__)
 
 
 
-class MyCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching RBFA data."""
+class RbfaLayerCoordinator(DataUpdateCoordinator):
+    """Base class for the coordinator of one kind of RBFA data."""
 
-    def __init__(self, hass: HomeAssistant, my_api) -> None:
+    layer = None
+    interval = None
+    description = None
+
+    def __init__(self, hass: HomeAssistant, collector: TeamApp) -> None:
         """Initialize the coordinator."""
 
-        self.collector = TeamApp(hass, my_api)
+        self.collector = collector
         super().__init__(
             hass,
             _LOGGER,
-            name=f"{DOMAIN}",
-            update_interval=timedelta(minutes=15),
+            name=f"{DOMAIN} {self.layer} {collector.team}",
+            update_interval=self.interval,
         )
-        self.api = my_api
 
     async def _async_update_data(self):
-        """Fetch data from the RBFA service."""
-        _LOGGER.debug('fetch data coordinator')
-        await self.collector.update(self.api)
+        """Fetch the layer, a failed request makes the update fail."""
+        try:
+            return await self._async_fetch()
+        except RbfaConnectionError as exc:
+            raise UpdateFailed(f"Error fetching {self.description}: {exc}") from exc
+
+    async def _async_fetch(self):
+        raise NotImplementedError
+
+
+class TeamCoordinator(RbfaLayerCoordinator):
+    """Class to manage fetching the RBFA team info."""
+
+    layer = 'team'
+    description = 'team info'
+    interval = TEAM_INTERVAL
+
+    async def _async_fetch(self):
+        """Fetch the team info from the RBFA service."""
+        _LOGGER.debug('fetch team coordinator')
+        teamdata = await self.collector.update_team()
+
+        if teamdata:
+            directory = await async_get_directory(self.hass)
+            directory.add_team(self.collector.team, teamdata.get('name'), teamdata.get('clubName'), teamdata.get('clubId'))
+
+        return teamdata
+
+
+class CalendarCoordinator(RbfaLayerCoordinator):
+    """Class to manage fetching the RBFA calendar."""
+
+    layer = 'calendar'
+    description = 'calendar'
+    interval = CALENDAR_INTERVAL
+
+    async def _async_fetch(self):
+        """Fetch the calendar from the RBFA service."""
+        _LOGGER.debug('fetch calendar coordinator')
+        await self.collector.update_calendar()
+
+        directory = await async_get_directory(self.hass)
+        directory.add_calendar(self.collector.calendar)
+
+        return self.collector.matchdata
+
+
+class DetailsCoordinator(RbfaLayerCoordinator):
+    """Class to manage fetching the RBFA match details."""
+
+    layer = 'details'
+    description = 'match details'
+    interval = DETAILS_INTERVAL
+
+    async def _async_fetch(self):
+        """Fetch the details of all matches from the RBFA service."""
+        _LOGGER.debug('fetch details coordinator')
+        await self.collector.update_details()
+        return self.collector.matchdata
+
+
+class RankingCoordinator(RbfaLayerCoordinator):
+    """Class to manage fetching the RBFA rankings."""
+
+    layer = 'ranking'
+    description = 'rankings'
+    interval = RANKING_INTERVAL
+
+    async def _async_fetch(self):
+        """Fetch the rankings from the RBFA service."""
+        _LOGGER.debug('fetch ranking coordinator')
+        await self.collector.update_rankings()
+        return self.collector.rankings
+
+
+class RbfaData:
+    """The data layers of one team.
+
+    Each layer has its own coordinator and cadence, entities only listen
+    to the layers they show. A calendar update fetches the details of new
+    matches and the rankings of new series, nothing else. New results
+    update the provisional standings, or refresh the ranking of series
+    whose ranking lacks the columns to compute them. While standings are
+    provisional the official ranking is fetched again after
+    PROVISIONAL_REFRESH, doubling up to RANKING_INTERVAL. When the upcoming
+    match ends the next one is promoted locally, without waiting for a
+    refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.collector = TeamApp(hass, entry)
+        self.team = TeamCoordinator(hass, self.collector)
+        self.calendar = CalendarCoordinator(hass, self.collector)
+        self.details = DetailsCoordinator(hass, self.collector)
+        self.ranking = RankingCoordinator(hass, self.collector)
+        self.logos = None
+        self._result = None
+        self._fetching_details = False
+        self._unsub: list[CALLBACK_TYPE] = []
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+        self._unsub_provisional: CALLBACK_TYPE | None = None
+        self._provisional_delay = None
+        self._shutdown_listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def layers(self):
+        return (self.team, self.calendar, self.details, self.ranking)
+
+    async def async_config_entry_first_refresh(self):
+        """Refresh all layers for the first time and link them."""
+        for layer in self.layers:
+            await layer.async_config_entry_first_refresh()
+        await self._async_start()
+
+    async def async_refresh(self):
+        """Refresh all layers."""
+        for layer in self.layers:
+            await layer.async_refresh()
+        if not self._unsub:
+            await self._async_start()
+
+    async def _async_start(self):
+        self.logos = await async_get_logo_cache(self.hass)
+        self._result = self._last_result()
+        self._unsub.append(self.calendar.async_add_listener(self._async_calendar_updated))
+        self._unsub.append(self.async_add_listener(self._async_schedule_rollover))
+        self._unsub.append(
+            self.async_add_listener(self._async_schedule_provisional_refresh, [self.calendar, self.ranking])
+        )
+        self._async_schedule_rollover()
+        self._async_schedule_provisional_refresh()
+        self._async_prefetch_logos()
+
+    async def async_shutdown(self):
+        """Stop the layers and tell the shutdown listeners."""
+        while self._shutdown_listeners:
+            self._shutdown_listeners.pop()()
+        while self._unsub:
+            self._unsub.pop()()
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+        if self._unsub_provisional is not None:
+            self._unsub_provisional()
+            self._unsub_provisional = None
+        for layer in self.layers:
+            await layer.async_shutdown()
+        self.collector.client.close()
+
+    def _last_result(self):
+        last = self.collector.matchdata['lastmatch']
+        if last is None:
+            return None
+        return (last['seriesid'], last['matchid'], last['hometeamgoals'], last['awayteamgoals'])
+
+    @callback
+    def _async_calendar_updated(self):
+        """Fetch only what a calendar update made necessary."""
+        if self.collector.missing_details() and not self._fetching_details:
+            self._fetching_details = True
+            self.hass.async_create_background_task(
+                self._async_update_missing_details(), f"{DOMAIN} details {self.collector.team}"
+            )
+
+        refresh = bool(self.collector.ranking_series() - set(self.collector.series_rankings))
+
+        result = self._last_result()
+        if result != self._result:
+            self._result = result
+            standings = self.collector.standings.get(result[0]) if result else None
+            if standings is None or not standings.enabled:
+                refresh = True
+
+        if refresh:
+            self.hass.async_create_task(self.ranking.async_request_refresh())
+
+        self._async_prefetch_logos()
+
+    @callback
+    def _async_schedule_rollover(self):
+        """Schedule the switch to the next match at the end of the upcoming one."""
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+        upcoming = self.collector.matchdata['upcoming']
+        if upcoming is None:
+            return
+
+        self._unsub_rollover = async_track_point_in_utc_time(
+            self.hass, self._async_rollover, dt_util.as_utc(upcoming['endtime']) + ROLLOVER_DELAY
+        )
+
+    @callback
+    def _async_schedule_provisional_refresh(self):
+        """Fetch the official ranking again, backing off, while standings are provisional."""
+        if not any(standings.provisional for standings in self.collector.standings.values()):
+            if self._unsub_provisional is not None:
+                self._unsub_provisional()
+                self._unsub_provisional = None
+            self._provisional_delay = None
+            return
+        if self._unsub_provisional is not None:
+            return
+
+        if self._provisional_delay is None:
+            self._provisional_delay = PROVISIONAL_REFRESH
+        else:
+            self._provisional_delay = min(self._provisional_delay * 2, RANKING_INTERVAL)
+        _LOGGER.debug('provisional standings, refresh ranking in %s', self._provisional_delay)
+        self._unsub_provisional = async_call_later(
+            self.hass, self._provisional_delay, self._async_provisional_refresh
+        )
+
+    @callback
+    def _async_provisional_refresh(self, now):
+        self._unsub_provisional = None
+        self.hass.async_create_task(self.ranking.async_request_refresh())
+
+    @callback
+    def _async_rollover(self, now):
+        """Make the upcoming match the last one and promote the next, without fetching."""
+        _LOGGER.debug('rollover to the next match')
+        self._unsub_rollover = None
+        self.collector.process()
+        self.calendar.async_update_listeners()
+
+    async def _async_update_missing_details(self):
+        try:
+            await self.collector.update_details(missing_only=True)
+        except RbfaConnectionError as exc:
+            _LOGGER.debug('Error fetching new match details: %s', exc)
+            return
+        finally:
+            self._fetching_details = False
+        self.details.async_set_updated_data(self.collector.matchdata)
+
+    @callback
+    def _async_prefetch_logos(self):
+        self.hass.async_create_background_task(
+            self._async_fetch_logos(), f"{DOMAIN} logos {self.collector.team}"
+        )
+
+    async def _async_fetch_logos(self):
+        """Cache the logos of all matches, switch entities to them when added."""
+        urls = set()
+        for match in self.collector.matches.values():
+            urls.add(match['hometeamlogo'])
+            urls.add(match['awayteamlogo'])
+            if match['channel']:
+                urls.add(CHANNEL_LOGO.format(match['channel'].upper()))
+        if await self.logos.async_prefetch(urls):
+            self.calendar.async_update_listeners()
+
+    @callback
+    def async_add_listener(self, update_callback, layers=None) -> CALLBACK_TYPE:
+        """Listen for updates of some or all layers."""
+        unsubs = [
+            layer.async_add_listener(update_callback)
+            for layer in (self.layers if layers is None else layers)
+        ]
+
+        @callback
+        def remove_listener():
+            for unsub in unsubs:
+                unsub()
+
+        return remove_listener
+
+    @callback
+    def async_on_shutdown(self, shutdown_callback) -> CALLBACK_TYPE:
+        """Call shutdown_callback when the entry is unloaded."""
+        self._shutdown_listeners.append(shutdown_callback)
+
+        @callback
+        def remove_listener():
+            if shutdown_callback in self._shutdown_listeners:
+                self._shutdown_listeners.remove(shutdown_callback)
+
+        return remove_listener
+
+    def option(self, key, default=None):
+        """Return an option, falling back to the entry data."""
+        if key in self.entry.options:
+            return self.entry.options[key]
+        return self.entry.data.get(key, default)
+
+    @callback
+    def async_apply_options(self):
+        """Apply changed options by processing the cached payloads again."""
+        _LOGGER.debug('apply options')
+        self.collector.process()
+        self.calendar.async_update_listeners()
+
+    def logo(self, url, thumbnail=False):
+        """Return the local URL of a logo when cached."""
+        if self.logos is None:
+            return url
+        return self.logos.url(url, thumbnail)
+
+    @property
+    def matchdata(self):
         return self.collector.matchdata
 
     @property
@@ -40,3 +348,11 @@ class MyCoordinator(DataUpdateCoordinator):
     @property
     def teamdata(self):
         return self.collector.teamdata
+
+    @property
+    def matches(self):
+        return self.collector.matches
+
+    @property
+    def rankings(self):
+        return self.collector.rankings
@@ -0,0 +1,21 @@
+"""Diagnostics support for RBFA."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .rbfa_core.client import RESPONSE_CACHE
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        'data': dict(entry.data),
+        'options': dict(entry.options),
+        # The HTTP cache is shared, its statistics cover all RBFA entries.
+        'http_cache_all_entries': RESPONSE_CACHE.snapshot(),
+    }
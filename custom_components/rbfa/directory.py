@@ -0,0 +1,195 @@
+"""Local directory of RBFA clubs and teams used for validation and search."""
+from __future__ import annotations
+
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+
+import requests
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .rbfa_core.client import get_operation
+from .const import DOMAIN, DATA_DIRECTORY, DIRECTORY_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.directory"
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+class CannotConnect(Exception):
+    """Error to indicate the RBFA service could not be reached."""
+
+
+def _tokens(text: str | None) -> set[str]:
+    """Split a name into lowercase tokens without accents."""
+    if not text:
+        return set()
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return {t for t in re.split(r'[^0-9a-z]+', text.lower()) if t}
+
+
+async def async_get_directory(hass: HomeAssistant) -> TeamDirectory:
+    """Return the shared team directory, loading it on first use.
+
+    Concurrent callers wait for the same load, so there is only ever one
+    directory and one Store writing its key.
+    """
+    if DATA_DIRECTORY not in hass.data:
+        hass.data[DATA_DIRECTORY] = hass.async_create_task(
+            _async_load_directory(hass), f"{DOMAIN} directory"
+        )
+    return await hass.data[DATA_DIRECTORY]
+
+
+async def _async_load_directory(hass: HomeAssistant) -> TeamDirectory:
+    directory = TeamDirectory(hass)
+    await directory.async_load()
+    return directory
+
+
+class TeamDirectory:
+    """Cached, token indexed directory of teams.
+
+    Teams are added when they are validated through GetTeam, listed by
+    getClubInfo or seen as an opponent in a team calendar. Entries older
+    than DIRECTORY_TTL are dropped, so lookups go back to the API
+    eventually while searches never do.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._teams: dict[str, dict] = {}
+        self._clubs: dict[str, dict] = {}
+        self._index: dict[str, set[str]] = {}
+        self._keys: list[str] = []
+
+    async def async_load(self) -> None:
+        """Load the directory from storage and drop expired entries."""
+        data = await self._store.async_load() or {}
+        cutoff = dt_util.utcnow().timestamp() - DIRECTORY_TTL.total_seconds()
+        self._clubs = {k: v for k, v in data.get('clubs', {}).items() if v['updated'] >= cutoff}
+        self._teams = {}
+        for team in data.get('teams', {}).values():
+            if team['updated'] >= cutoff:
+                self._add(team)
+        self._keys = sorted(self._index)
+        _LOGGER.debug('directory loaded: %d teams, %d clubs', len(self._teams), len(self._clubs))
+
+    def _data_to_save(self) -> dict:
+        return {'teams': self._teams, 'clubs': self._clubs}
+
+    def _fresh(self, entry: dict | None) -> bool:
+        if entry is None:
+            return False
+        return dt_util.utcnow().timestamp() - entry['updated'] < DIRECTORY_TTL.total_seconds()
+
+    def _add(self, team: dict) -> None:
+        old = self._teams.get(team['id'])
+        if old is not None:
+            for token in _tokens(old['name']) | _tokens(old.get('club')):
+                self._index.get(token, set()).discard(old['id'])
+        self._teams[team['id']] = team
+        for token in _tokens(team['name']) | _tokens(team.get('club')):
+            self._index.setdefault(token, set()).add(team['id'])
+
+    def add_team(self, team_id, name, club=None, club_id=None) -> None:
+        """Add or refresh a team in the directory."""
+        if team_id is None or not name:
+            return
+        team_id = str(team_id)
+        old = self._teams.get(team_id, {})
+        self._add({
+            'id': team_id,
+            'name': name,
+            'club': club or old.get('club'),
+            'club_id': str(club_id) if club_id else old.get('club_id'),
+            'updated': dt_util.utcnow().timestamp(),
+        })
+        self._keys = sorted(self._index)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def add_calendar(self, calendar: list[dict]) -> None:
+        """Add the teams of a raw GetTeamCalendar response."""
+        for item in calendar:
+            for side in ('homeTeam', 'awayTeam'):
+                team = item.get(side) or {}
+                if team.get('id') and self._teams.get(str(team['id'])) is None:
+                    self.add_team(team['id'], team.get('name'))
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Return the teams matching all words of the query by prefix."""
+        result = None
+        for token in _tokens(query):
+            ids = set()
+            i = bisect_left(self._keys, token)
+            while i < len(self._keys) and self._keys[i].startswith(token):
+                ids |= self._index[self._keys[i]]
+                i += 1
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        if result is None:
+            return []
+        teams = [self._teams[t] for t in result]
+        teams.sort(key=lambda t: ((t.get('club') or ''), t['name']))
+        return teams[:limit]
+
+    def club_teams(self, club_id: str) -> list[dict]:
+        """Return the known teams of a club."""
+        teams = [t for t in self._teams.values() if t.get('club_id') == str(club_id)]
+        teams.sort(key=lambda t: t['name'])
+        return teams
+
+    async def _async_fetch(self, operation, value):
+        def fetch():
+            with requests.Session() as session:
+                return get_operation(session, operation, value)
+
+        try:
+            return await self.hass.async_add_executor_job(fetch)
+        except requests.exceptions.RequestException as exc:
+            raise CannotConnect from exc
+
+    async def async_get_team(self, team_id: str) -> dict | None:
+        """Return a team, validating it through GetTeam when not cached."""
+        team = self._teams.get(str(team_id))
+        if self._fresh(team) and team.get('club'):
+            return team
+
+        r = await self._async_fetch('GetTeam', team_id)
+        if r is None:
+            return None
+
+        data = r['data']['team']
+        self.add_team(team_id, data.get('name'), data.get('clubName'), data.get('clubId'))
+        return self._teams.get(str(team_id))
+
+    async def async_get_club(self, club_id: str) -> dict | None:
+        """Return a club through getClubInfo and add the teams it lists."""
+        club = self._clubs.get(str(club_id))
+        if self._fresh(club):
+            return club
+
+        r = await self._async_fetch('getClubInfo', club_id)
+        if r is None:
+            return None
+
+        data = r['data']['clubInfo']
+        club = {
+            'id': str(club_id),
+            'name': data.get('name'),
+            'updated': dt_util.utcnow().timestamp(),
+        }
+        self._clubs[str(club_id)] = club
+        for team in data.get('teams') or []:
+            self.add_team(team.get('id'), team.get('name'), club['name'], club_id)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return club
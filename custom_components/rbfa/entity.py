@@ -1,20 +1,42 @@
-
 from __future__ import annotations
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .coordinator import MyCoordinator
+from .coordinator import CalendarCoordinator, RbfaData
+
 
+class RbfaEntity(CoordinatorEntity[CalendarCoordinator]):
+    """Defines a RBFA entity.
 
-class RbfaEntity(CoordinatorEntity[MyCoordinator]):
-    """Defines an Elgato entity."""
+    The calendar is the main coordinator; the other layers an entity
+    shows are listed in _layers and only those wake it up.
+    """
 
     _attr_has_entity_name = True
+    _layers: tuple[str, ...] = ()
 
-    def __init__(self, coordinator: MyCoordinator) -> None:
-        """Initialize an Elgato entity."""
-        super().__init__(coordinator=coordinator)
+    def __init__(self, rbfa: RbfaData) -> None:
+        """Initialize a RBFA entity."""
+        super().__init__(coordinator=rbfa.calendar)
+        self.rbfa = rbfa
         self._attr_device_info = {
-            "identifiers": {("rbfa", coordinator.config_entry.entry_id)},
+            "identifiers": {("rbfa", rbfa.entry.entry_id)},
             "name": "RBFA",  # Préfixe qui apparaîtra pour toutes les entités
             "manufacturer": "RBFA",
             "model": "Football Matches",
         }
+
+    @property
+    def language(self) -> str:
+        """Return the configured language (nl, fr, en)."""
+        return self.rbfa.option('language', 'nl')
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to the extra layers too."""
+        await super().async_added_to_hass()
+        if not self._layers:
+            return
+        self.async_on_remove(
+            self.rbfa.async_add_listener(
+                self._handle_coordinator_update,
+                [getattr(self.rbfa, layer) for layer in self._layers],
+            )
+        )
@@ -0,0 +1,222 @@
+"""Local cache for team and channel logos."""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import mimetypes
+import re
+from pathlib import Path
+
+import requests
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, DATA_LOGOS, LOGO_MAX_SIZE, LOGO_RETRY, THUMBNAIL_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.logos"
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+LOGO_URL = '/api/rbfa/logo/{}'
+LOGO_NAME = re.compile(r'^[0-9a-f]{64}(_thumb)?$')
+LOGO_TYPES = {
+    'image/png',
+    'image/jpeg',
+    'image/gif',
+    'image/webp',
+    'image/svg+xml',
+}
+
+
+async def async_get_logo_cache(hass: HomeAssistant) -> LogoCache:
+    """Return the shared logo cache, loading it on first use."""
+    if DATA_LOGOS not in hass.data:
+        cache = LogoCache(hass)
+        await cache.async_load()
+        hass.data[DATA_LOGOS] = cache
+    return hass.data[DATA_LOGOS]
+
+
+class LogoCache:
+    """Downloads every distinct logo once and stores it under its content hash.
+
+    Logo URLs repeat across matches and teams, the cache is keyed by URL
+    and shared by all entries. Identical images behind different URLs
+    are stored once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.path = Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}_logos"))
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._urls: dict[str, dict] = {}
+        self._files: dict[str, str] = {}
+        self._failed: dict[str, float] = {}
+        self._pending: set[str] = set()
+
+    async def async_load(self) -> None:
+        """Load the URL index from storage."""
+        data = await self._store.async_load() or {}
+        self._urls = {
+            url: logo for url, logo in data.get('urls', {}).items()
+            if logo['content_type'] in LOGO_TYPES
+        }
+        for logo in self._urls.values():
+            self._files[logo['hash']] = logo['content_type']
+            if logo.get('thumbnail'):
+                self._files[f"{logo['hash']}_thumb"] = 'image/png'
+
+    def _data_to_save(self) -> dict:
+        return {'urls': self._urls}
+
+    def url(self, remote: str | None, thumbnail: bool = False) -> str | None:
+        """Return the local URL of a logo, or the remote one when not cached yet."""
+        logo = self._urls.get(remote)
+        if logo is None:
+            return remote
+        if thumbnail and logo.get('thumbnail'):
+            return LOGO_URL.format(f"{logo['hash']}_thumb")
+        return LOGO_URL.format(logo['hash'])
+
+    def file(self, name: str) -> tuple[Path, str] | None:
+        """Return the path and content type of a cached file."""
+        if not LOGO_NAME.match(name) or name not in self._files:
+            return None
+        return self.path / name, self._files[name]
+
+    async def async_prefetch(self, urls) -> bool:
+        """Download the logos that are not cached yet, return True if any were added."""
+        now = dt_util.utcnow().timestamp()
+        missing = {
+            url for url in urls
+            if url and url not in self._urls and url not in self._pending
+            and now - self._failed.get(url, 0) > LOGO_RETRY.total_seconds()
+        }
+        if not missing:
+            return False
+
+        added = False
+        self._pending |= missing
+        for url in missing:
+            try:
+                logo = await self.hass.async_add_executor_job(self._download, url)
+            finally:
+                self._pending.discard(url)
+            if logo is None:
+                self._failed[url] = now
+                continue
+            self._urls[url] = logo
+            self._files[logo['hash']] = logo['content_type']
+            if logo['thumbnail']:
+                self._files[f"{logo['hash']}_thumb"] = 'image/png'
+            added = True
+
+        if added:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return added
+
+    def _read(self, url: str) -> tuple[bytes, str] | None:
+        """Return the body and Content-Type of a logo, None when it fails or exceeds LOGO_MAX_SIZE."""
+        try:
+            with requests.get(url, timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    _LOGGER.debug('Invalid response downloading logo %s', url)
+                    return None
+                if int(response.headers.get('Content-Length') or 0) > LOGO_MAX_SIZE:
+                    _LOGGER.debug('Logo %s is larger than %d bytes', url, LOGO_MAX_SIZE)
+                    return None
+                content = bytearray()
+                for chunk in response.iter_content(chunk_size=16384):
+                    content += chunk
+                    if len(content) > LOGO_MAX_SIZE:
+                        _LOGGER.debug('Logo %s is larger than %d bytes', url, LOGO_MAX_SIZE)
+                        return None
+                return bytes(content), response.headers.get('Content-Type', '')
+        except (requests.exceptions.RequestException, ValueError) as exc:
+            _LOGGER.debug('Error downloading logo %s: %r', url, exc)
+            return None
+
+    def _download(self, url: str) -> dict | None:
+        result = self._read(url)
+        if result is None:
+            return None
+        content, content_type = result
+        if not content:
+            _LOGGER.debug('Empty logo %s', url)
+            return None
+
+        content_type = content_type.split(';')[0].strip().lower()
+        if content_type not in LOGO_TYPES:
+            content_type = mimetypes.guess_type(url)[0]
+        if content_type not in LOGO_TYPES:
+            _LOGGER.debug('Unsupported logo type %s for %s', content_type, url)
+            return None
+        digest = hashlib.sha256(content).hexdigest()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self.path / digest
+        if not target.exists():
+            target.write_bytes(content)
+
+        thumbnail = self._thumbnail(content, content_type, self.path / f"{digest}_thumb")
+        _LOGGER.debug('cached logo %s as %s', url, digest)
+        return {'hash': digest, 'content_type': content_type, 'thumbnail': thumbnail}
+
+    def _thumbnail(self, content: bytes, content_type: str, target: Path) -> bool:
+        """Write a PNG thumbnail of raster logos when Pillow is available."""
+        if content_type == 'image/svg+xml':
+            return False
+        if target.exists():
+            return True
+        try:
+            from PIL import Image
+        except ImportError:
+            return False
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+                image.save(target, 'PNG')
+        except Exception as exc:
+            _LOGGER.debug('Cannot create thumbnail: %r', exc)
+            target.unlink(missing_ok=True)
+            return False
+        return True
+
+
+class RbfaLogoView(HomeAssistantView):
+    """Serve cached logos with long lived cache headers.
+
+    Files are addressed by content hash and never change, so browsers
+    can keep them forever. The view needs no authentication, logos are
+    served sandboxed so an SVG cannot run script in the HA origin.
+    """
+
+    url = '/api/rbfa/logo/{name}'
+    name = 'api:rbfa:logo'
+    requires_auth = False
+
+    def __init__(self, cache: LogoCache) -> None:
+        self.cache = cache
+
+    async def get(self, request: web.Request, name: str) -> web.StreamResponse:
+        """Return a cached logo."""
+        found = self.cache.file(name)
+        if found is None:
+            raise web.HTTPNotFound
+        path, content_type = found
+        return web.FileResponse(
+            path,
+            headers={
+                hdrs.CONTENT_TYPE: content_type,
+                hdrs.CACHE_CONTROL: 'public, max-age=31536000, immutable',
+                'Content-Security-Policy': 'sandbox',
+                'X-Content-Type-Options': 'nosniff',
+            },
+        )
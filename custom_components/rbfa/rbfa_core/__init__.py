@@ -0,0 +1,21 @@
+"""RBFA client and match normalisation without Home Assistant.
+
+Only relative imports and no Home Assistant modules are used inside
+this package, so it can be used by the integration as well as on its
+own. scripts/rbfa_export.py runs the export CLI:
+
+    python scripts/rbfa_export.py --team 300872 --format json ics
+"""
+from .client import RESPONSE_CACHE, RbfaClient, RbfaConnectionError, ResponseCache, get_operation
+from .normalize import normalize
+from .standings import SeriesStandings
+
+__all__ = [
+    'RESPONSE_CACHE',
+    'RbfaClient',
+    'RbfaConnectionError',
+    'ResponseCache',
+    'SeriesStandings',
+    'get_operation',
+    'normalize',
+]
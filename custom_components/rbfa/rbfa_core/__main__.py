@@ -0,0 +1,99 @@
+"""Bulk export of RBFA teams and clubs to JSON and ICS.
+
+Example:
+
+    python scripts/rbfa_export.py --club 2438 --team 300872 --format json ics --output export --parallel 8
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from .client import RESPONSE_CACHE, RbfaClient, RbfaConnectionError
+from .export import club_teams, export_team, to_ics, to_json
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def run(args):
+    if args.cache:
+        RESPONSE_CACHE.load(args.cache)
+
+    client = RbfaClient(language=args.language, max_parallel=args.parallel)
+    try:
+        return await _export(args, client)
+    finally:
+        client.close()
+
+
+async def _export(args, client):
+    teams = list(dict.fromkeys(args.team))
+    failed = 0
+    clubs = await asyncio.gather(*(club_teams(client, c) for c in args.club), return_exceptions=True)
+    for club, ids in zip(args.club, clubs):
+        if isinstance(ids, BaseException):
+            if not isinstance(ids, RbfaConnectionError):
+                raise ids
+            _LOGGER.error('club %s: %s', club, ids)
+            failed += 1
+            continue
+        if not ids:
+            _LOGGER.warning('no teams found for club %s', club)
+        teams += [team for team in ids if team not in teams]
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    exports = await asyncio.gather(
+        *(export_team(client, team, duration=args.duration) for team in teams), return_exceptions=True
+    )
+    for team, export in zip(teams, exports):
+        if isinstance(export, BaseException):
+            if not isinstance(export, RbfaConnectionError):
+                raise export
+            _LOGGER.error('team %s: %s', team, export)
+            failed += 1
+            continue
+        if export is None:
+            _LOGGER.warning('team %s not found', team)
+            failed += 1
+            continue
+        if 'json' in args.format:
+            (output / f'{team}.json').write_text(to_json(export), encoding='utf-8')
+        if 'ics' in args.format:
+            (output / f'{team}.ics').write_text(to_ics(export), encoding='utf-8', newline='')
+        _LOGGER.info('exported team %s: %d matches', team, len(export['matches']))
+
+    if args.cache:
+        RESPONSE_CACHE.save(args.cache)
+
+    for line in RESPONSE_CACHE.format_stats():
+        _LOGGER.info(line)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='rbfa_core', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--team', nargs='+', default=[], help='team ids')
+    parser.add_argument('--club', nargs='+', default=[], help='club ids, all teams listed by the club are exported')
+    parser.add_argument('--format', nargs='+', choices=['json', 'ics'], default=['json'])
+    parser.add_argument('--output', default='.', help='directory for the exported files')
+    parser.add_argument('--parallel', type=int, default=4, help='maximum concurrent requests')
+    parser.add_argument('--language', choices=['nl', 'fr', 'en'], default='nl')
+    parser.add_argument('--duration', type=int, default=105, help='match duration in minutes')
+    parser.add_argument('--cache', help='JSON file that keeps the response cache between runs')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    if not args.team and not args.club:
+        parser.error('give at least one --team or --club')
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, stream=sys.stderr)
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Client for the persisted GraphQL queries of the RBFA datalake."""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .const import API_URL, HASHES, HTTP_CACHE_SIZE, REQUIRED, VARIABLES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RbfaConnectionError(Exception):
+    """The RBFA service could not be reached or answered with an error status."""
+
+
+class ResponseCache(object):
+    """HTTP cache for the GraphQL GET requests.
+
+    Keeps the ETag/Last-Modified validators and the body of each URL,
+    answers from memory while the Cache-Control max-age lasts and sends
+    conditional requests afterwards. The cache is shared by all entries
+    and used from executor threads.
+
+    Transfer statistics are kept per operation. bytes_received counts
+    the bytes on the wire, compression_saved the decompressed size of
+    downloaded bodies minus what was received, cache_saved the size of
+    the bodies answered from the cache, fresh or not modified.
+    """
+
+    def __init__(self, size=HTTP_CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _count(self, operation, **values):
+        with self._lock:
+            stats = self.stats.setdefault(operation, {
+                'requests': 0,
+                'fresh': 0,
+                'not_modified': 0,
+                'downloaded': 0,
+                'bytes_received': 0,
+                'compression_saved': 0,
+                'cache_saved': 0,
+            })
+            for key, value in values.items():
+                stats[key] += value
+
+    @staticmethod
+    def _max_age(response):
+        """Return the max-age in seconds, 0 when the response must be revalidated, None when it must not be stored."""
+        directives = {}
+        for part in response.headers.get('Cache-Control', '').split(','):
+            key, _, value = part.strip().partition('=')
+            directives[key.lower()] = value
+
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        try:
+            return max(0, int(directives.get('max-age', 0)))
+        except ValueError:
+            return 0
+
+    def get(self, session, operation, url):
+        """Return the JSON body of url, or None when the server did not return it."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+
+        if entry is not None and entry['expires'] > time.time():
+            self._count(operation, requests=1, fresh=1, cache_saved=entry['size'])
+            return json.loads(entry['body'])
+
+        headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            self._count(operation, requests=1, not_modified=1, cache_saved=entry['size'])
+            max_age = self._max_age(response)
+            with self._lock:
+                entry['etag'] = response.headers.get('ETag') or entry['etag']
+                entry['last_modified'] = response.headers.get('Last-Modified') or entry['last_modified']
+                entry['expires'] = time.time() + (max_age or 0)
+                body = entry['body']
+            return json.loads(body)
+
+        if response.status_code != 200:
+            self._count(operation, requests=1)
+            _LOGGER.debug('Invalid response from server for collection data')
+            response.raise_for_status()
+            return
+
+        body = response.content
+        received = int(response.headers.get('Content-Length') or len(body))
+        self._count(
+            operation,
+            requests=1,
+            downloaded=1,
+            bytes_received=received,
+            compression_saved=max(0, len(body) - received),
+        )
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        max_age = self._max_age(response)
+        if max_age is not None and (etag or last_modified or max_age):
+            with self._lock:
+                self._entries[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'expires': time.time() + max_age,
+                    'body': body,
+                    'size': len(body),
+                }
+                self._entries.move_to_end(url)
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+
+        return json.loads(body)
+
+    def save(self, path):
+        """Write the cached responses to a JSON file."""
+        with self._lock:
+            entries = {
+                url: {**entry, 'body': entry['body'].decode()}
+                for url, entry in self._entries.items()
+            }
+        with open(path, 'w') as cache_file:
+            json.dump(entries, cache_file)
+
+    def load(self, path):
+        """Read cached responses written by save()."""
+        try:
+            with open(path) as cache_file:
+                entries = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            for url, entry in entries.items():
+                self._entries[url] = {**entry, 'body': entry['body'].encode()}
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def snapshot(self):
+        """Return a copy of the statistics per operation, taken under the lock."""
+        with self._lock:
+            return {operation: dict(stats) for operation, stats in self.stats.items()}
+
+    def format_stats(self):
+        """Return one line of statistics per operation."""
+        return [
+            '{}: {requests} requests, {fresh} fresh, {not_modified} not modified, {downloaded} downloaded, '
+            '{bytes_received} bytes received, {compression_saved} bytes saved by compression, '
+            '{cache_saved} bytes saved by the cache'.format(operation, **stats)
+            for operation, stats in self.snapshot().items()
+        ]
+
+    def log_stats(self, level=logging.DEBUG):
+        if not _LOGGER.isEnabledFor(level):
+            return
+        for line in self.format_stats():
+            _LOGGER.log(level, line)
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def get_operation(session, operation, value, language='nl', cache=RESPONSE_CACHE, api_url=None):
+    """Run a persisted RBFA query, return the response or None when there are no results.
+
+    Connection errors and HTTP error statuses are raised as requests
+    exceptions, so they can be told apart from a query without results.
+    """
+    url = '{}?operationName={}&variables={{"{}":"{}","language":"{}"}}&extensions={{"persistedQuery":{{"version":1,"sha256Hash":"{}"}}}}'.format(
+        api_url or API_URL,
+        operation,
+        VARIABLES[operation],
+        value,
+        language,
+        HASHES[operation]
+    )
+    rj = cache.get(session, operation, url)
+    if rj is None:
+        return
+
+    if rj.get('data') is None:
+        _LOGGER.debug("Error for operation {}: {}".format(operation, rj['errors'][0]['message']))
+
+    elif rj['data'][REQUIRED[operation]] == None:
+        _LOGGER.debug('no results')
+
+    else:
+        return rj
+
+
+class RbfaClient(object):
+    """Async client for the RBFA service.
+
+    Requests run in threads, at most max_parallel at a time, over one
+    session whose connection pool holds max_parallel connections, and
+    share the response cache. run_job runs a blocking function and
+    defaults to asyncio.to_thread; Home Assistant passes
+    hass.async_add_executor_job. Queries without results return None,
+    failed requests raise RbfaConnectionError. close() releases the
+    connections.
+    """
+
+    def __init__(self, language='nl', max_parallel=4, cache=RESPONSE_CACHE, api_url=None, run_job=None):
+        self.language = language
+        self.cache = cache
+        self.api_url = api_url
+        self._run_job = run_job or asyncio.to_thread
+        self._max_parallel = max_parallel
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._session = None
+
+    def _get_session(self):
+        with self._lock:
+            if self._session is None:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_parallel)
+                self._session = requests.Session()
+                self._session.mount('https://', adapter)
+                self._session.mount('http://', adapter)
+            return self._session
+
+    def close(self):
+        """Close the session and its connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _get(self, operation, value):
+        try:
+            return get_operation(self._get_session(), operation, value, self.language, self.cache, self.api_url)
+
+        except requests.exceptions.RequestException as exc:
+            raise RbfaConnectionError(f'{operation} {value}: {exc!r}') from exc
+
+    async def fetch(self, operation, value):
+        """Run a persisted query, return the response or None when there are no results."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_parallel)
+        async with self._semaphore:
+            return await self._run_job(self._get, operation, value)
+
+    async def get_team(self, team):
+        r = await self.fetch('GetTeam', team)
+        return r['data']['team'] if r is not None else None
+
+    async def get_calendar(self, team):
+        r = await self.fetch('GetTeamCalendar', team)
+        return r['data']['teamCalendar'] if r is not None else None
+
+    async def get_match(self, match):
+        r = await self.fetch('GetMatchDetail', match)
+        return r['data']['matchDetail'] if r is not None else None
+
+    async def get_ranking(self, series):
+        r = await self.fetch('GetSeriesRankings', series)
+        return r['data']['seriesRankings']['rankings'][0]['teams'] if r is not None else None
+
+    async def get_club(self, club):
+        r = await self.fetch('getClubInfo', club)
+        return r['data']['clubInfo'] if r is not None else None
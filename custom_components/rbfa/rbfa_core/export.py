@@ -0,0 +1,122 @@
+"""Export of complete team data to JSON and ICS."""
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from .normalize import normalize
+from .standings import SeriesStandings
+
+
+async def export_team(client, team, now=None, duration=105):
+    """Fetch everything of a team and return it normalised, or None when the team is unknown.
+
+    Raises RbfaConnectionError when a request fails.
+    """
+    now = now or datetime.now(timezone.utc)
+    teamdata, calendar = await asyncio.gather(client.get_team(team), client.get_calendar(team))
+    if calendar is None:
+        return None
+
+    ids = [item['id'] for item in calendar]
+    details = dict(zip(ids, await asyncio.gather(*(client.get_match(match) for match in ids))))
+    details = {k: v for k, v in details.items() if v is not None}
+
+    series = sorted({item['series']['id'] for item in calendar})
+    standings = {}
+    for seriesid, teams in zip(series, await asyncio.gather(*(client.get_ranking(s) for s in series))):
+        if teams is not None:
+            standings[seriesid] = SeriesStandings(teams, team)
+            standings[seriesid].update(calendar, seriesid, now, duration)
+
+    result = normalize(team, calendar, details, standings, now, duration)
+    upcoming = result['matchdata']['upcoming']
+    lastmatch = result['matchdata']['lastmatch']
+    return {
+        'id': team,
+        'team': teamdata,
+        'upcoming': upcoming['matchid'] if upcoming else None,
+        'lastmatch': lastmatch['matchid'] if lastmatch else None,
+        'matches': list(result['matches'].values()),
+        'collections': result['collections'],
+        'rankings': result['rankings'],
+    }
+
+
+async def club_teams(client, club):
+    """Return the ids of the teams getClubInfo lists for a club."""
+    info = await client.get_club(club)
+    if info is None:
+        return []
+    return [str(team['id']) for team in info.get('teams') or [] if team.get('id')]
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def to_json(export):
+    return json.dumps(
+        {k: v for k, v in export.items() if k != 'collections'},
+        default=_default,
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def _escape(text):
+    return (
+        (text or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold a content line at 75 octets as RFC 5545 requires."""
+    data = line.encode()
+    parts = []
+    while len(data) > 75:
+        cut = 75 if not parts else 74
+        while cut and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode())
+        data = data[cut:]
+    parts.append(data.decode())
+    return '\r\n '.join(parts)
+
+
+def _utc(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def to_ics(export, now=None):
+    stamp = _utc(now or datetime.now(timezone.utc))
+    team = export['team'] or {}
+    name = ' | '.join(n for n in (team.get('clubName'), team.get('name')) if n) or export['id']
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//RBFA//rbfa_core//EN',
+        f'X-WR-CALNAME:{_escape(name)}',
+    ]
+    for collection in export['collections']:
+        lines += [
+            'BEGIN:VEVENT',
+            f"UID:{collection['uid']}@rbfa.be",
+            f'DTSTAMP:{stamp}',
+            f"DTSTART:{_utc(collection['starttime'])}",
+            f"DTEND:{_utc(collection['endtime'])}",
+            f"SUMMARY:{_escape(collection['summary'])}",
+        ]
+        if collection['location']:
+            lines.append(f"LOCATION:{_escape(collection['location'])}")
+        lines += [
+            f"DESCRIPTION:{_escape(collection['description'])}",
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return ''.join(_fold(line) + '\r\n' for line in lines)
@@ -0,0 +1,141 @@
+"""Normalisation of the raw RBFA payloads into match data."""
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from .const import TZ
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize(team, calendar, details, standings, now, duration=105, show_ranking=True, show_referee=True):
+    """Build matches, calendar collections, next/last match and rankings.
+
+    calendar is the raw GetTeamCalendar list, details maps match ids to raw
+    GetMatchDetail payloads and standings maps series ids to
+    SeriesStandings. now is an aware datetime that decides which match is
+    upcoming. Nothing is fetched.
+    """
+    _LOGGER.debug('duration: %r', duration)
+    _LOGGER.debug('show ranking: %r', show_ranking)
+
+    upcoming = False
+    previous = None
+    matchdata = {'upcoming': None, 'lastmatch': None}
+    collections = []
+    matches = {}
+
+    for item in calendar:
+        location = None
+        referee = None
+        detail = details.get(item['id'])
+        if detail != None:
+            match = detail['location']
+            location='{}\n{} {}\nBelgium'.format(
+                match['address'],
+                match['postalCode'],
+                match['city'],
+            )
+            if show_referee:
+                for x in detail['officials']:
+                    if x['function'] == 'referee':
+                        referee = f"{x['firstName']} {x['lastName']}"
+
+        naive_dt  = datetime.strptime(item['startTime'], '%Y-%m-%dT%H:%M:%S')
+        starttime = naive_dt.replace(tzinfo = ZoneInfo(TZ))
+        endtime = starttime + timedelta(minutes=duration)
+
+        data = {
+            'matchid': item['id'],
+            'team': team,
+            'channel': item['channel'],
+            'starttime': starttime,
+            'endtime': endtime,
+            'location': location,
+            'referee': referee,
+            'hometeam': item['homeTeam']['name'],
+            'hometeamid': item['homeTeam']['id'],
+            'hometeamlogo': item['homeTeam']['logo'],
+            'hometeamgoals': item['outcome']['homeTeamGoals'],
+            'hometeampenalties': item['outcome']['homeTeamPenaltiesScored'],
+            'hometeamposition': None,
+            'awayteam': item['awayTeam']['name'],
+            'awayteamid': item['awayTeam']['id'],
+            'awayteamlogo': item['awayTeam']['logo'],
+            'awayteamgoals': item['outcome']['awayTeamGoals'],
+            'awayteampenalties': item['outcome']['awayTeamPenaltiesScored'],
+            'awayteamposition': None,
+            'series': item['series']['name'],
+            'seriesid': item['series']['id'],
+            'ranking': [],
+            'rankingprovisional': False,
+        }
+        matches[item['id']] = data
+
+        if endtime >= now and not upcoming:
+            upcoming = True
+            matchdata = {
+                'upcoming': data,
+                'lastmatch': previous
+            }
+
+        summary = item['homeTeam']['name'] + ' - ' + item['awayTeam']['name']
+        description = item['series']['name'] + ' (state: ' + item['state'] + ')'
+
+        if show_ranking:
+            result = 'No match score'
+            if item['outcome']['homeTeamGoals'] != None:
+                result = 'Goals: ' + str(item['outcome']['homeTeamGoals']) + ' - ' + str(item['outcome']['awayTeamGoals'])
+            if item['outcome']['homeTeamPenaltiesScored'] != None:
+                result += '; Penalties: ' + str(item['outcome']['homeTeamPenaltiesScored']) + ' - '
+                result += str(item['outcome']['awayTeamPenaltiesScored'])
+            description += "; " + result
+
+        collection = {
+            'uid': item['id'],
+            'starttime': starttime,
+            'endtime': endtime,
+            'summary': summary,
+            'location': location,
+            'description': description,
+        }
+
+        collections.append(collection)
+        previous = data
+
+    if not upcoming:
+        _LOGGER.debug('previous=last')
+        matchdata = {
+            'upcoming': None,
+            'lastmatch': previous
+        }
+
+    # The ranking goes on copies of the next and last match, so the match
+    # payloads do not carry the whole table.
+    matchdata = {tag: dict(data) if data is not None else None for tag, data in matchdata.items()}
+
+    rankings = {}
+    if show_ranking:
+        for seriesid, series_standings in standings.items():
+            rankings[seriesid] = series_standings.table()
+        for tag in ('upcoming', 'lastmatch'):
+            _set_ranking(matchdata[tag], rankings, standings)
+
+    return {
+        'matches': matches,
+        'collections': collections,
+        'matchdata': matchdata,
+        'rankings': rankings,
+    }
+
+
+def _set_ranking(data, rankings, standings):
+    if data is None or data['seriesid'] not in rankings:
+        return
+    data['ranking'] = rankings[data['seriesid']]
+    data['rankingprovisional'] = standings[data['seriesid']].provisional
+    for rank in data['ranking']:
+        if rank['id'] == data['hometeamid']:
+            data['hometeamposition'] = rank['position']
+        if rank['id'] == data['awayteamid']:
+            data['awayteamposition'] = rank['position']
@@ -0,0 +1,149 @@
+"""Provisional standings of a series, computed from match outcomes."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from .const import TZ
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+
+def _started(item: dict) -> datetime:
+    return datetime.strptime(item['startTime'], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=ZoneInfo(TZ))
+
+
+def finished_matches(calendar: list[dict], seriesid: str, ended_before: datetime | None = None) -> list[dict]:
+    """Return the matches of a series with a score, oldest first.
+
+    The calendar shows the live score of a match in progress. With
+    ended_before only matches that started before it count, pass now
+    minus the match duration to leave live scores out.
+    """
+    matches = [
+        item for item in calendar
+        if item['series']['id'] == seriesid and item['outcome']['homeTeamGoals'] is not None
+        and (ended_before is None or _started(item) <= ended_before)
+    ]
+    matches.sort(key=lambda item: item['startTime'])
+    return matches
+
+
+class SeriesStandings:
+    """Standings of one series: the official ranking plus the results it lacks.
+
+    The official ranking lags behind the scores in the calendar. Results
+    of the configured team that are not counted in its official
+    matchesPlayed are applied on top of the official table, which is
+    then sorted again on points, wins, goal difference and goals scored.
+    The table is rebuilt from the official rows on every update, so a
+    corrected score is not kept, and matches that have not ended are left
+    out. Only the calendar of the configured team is known, the other
+    results of the same matchday are missing until the official ranking
+    counts them. A new official ranking replaces the whole thing.
+
+    When the ranking lacks the points or matchesPlayed columns the
+    official table is returned unchanged.
+    """
+
+    def __init__(self, teams: list[dict], team: str) -> None:
+        self.team = team
+        self.applied: set[str] = set()
+        self.official = {}
+        for rank in teams:
+            self.official[rank['teamId']] = {
+                'id': rank['teamId'],
+                'team': rank['name'],
+                'official': rank['position'],
+                'position': rank['position'],
+                'played': rank.get('matchesPlayed'),
+                'points': rank.get('points'),
+                'wins': rank.get('wins') or 0,
+                'draws': rank.get('draws') or 0,
+                'losses': rank.get('losses') or 0,
+                'goals_for': rank.get('goalsScored') or 0,
+                'goals_against': rank.get('goalsConceded') or 0,
+            }
+        self.rows = self._official_rows()
+        own = self.rows.get(team)
+        self.official_played = own['played'] if own else None
+        self.enabled = own is not None and all(
+            row['points'] is not None and row['played'] is not None for row in self.rows.values()
+        )
+
+    @property
+    def provisional(self) -> bool:
+        return bool(self.applied)
+
+    def _official_rows(self) -> dict[str, dict]:
+        return {key: dict(row) for key, row in self.official.items()}
+
+    def update(self, calendar: list[dict], seriesid: str, now: datetime | None = None, duration: int = 105) -> bool:
+        """Apply the results of the configured team missing from the official table.
+
+        With now, an aware datetime, matches that have not ended given
+        their duration in minutes are left out. Return True if the table
+        changed.
+        """
+        if not self.enabled:
+            return False
+
+        ended_before = now - timedelta(minutes=duration) if now is not None else None
+        results = [
+            item for item in finished_matches(calendar, seriesid, ended_before)
+            if self.team in (item['homeTeam']['id'], item['awayTeam']['id'])
+        ]
+        before = (self.table(), self.applied)
+
+        self.rows = self._official_rows()
+        self.applied = set()
+        for item in results[self.official_played:]:
+            self._apply(item)
+            self.applied.add(item['id'])
+        if self.applied:
+            self._sort()
+
+        return (self.table(), self.applied) != before
+
+    def _apply(self, item: dict) -> None:
+        home = self.rows.get(item['homeTeam']['id'])
+        away = self.rows.get(item['awayTeam']['id'])
+        home_goals = item['outcome']['homeTeamGoals']
+        away_goals = item['outcome']['awayTeamGoals']
+
+        for row, scored, conceded in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+            if row is None:
+                continue
+            row['played'] += 1
+            row['goals_for'] += scored
+            row['goals_against'] += conceded
+            if scored > conceded:
+                row['wins'] += 1
+                row['points'] += POINTS_WIN
+            elif scored == conceded:
+                row['draws'] += 1
+                row['points'] += POINTS_DRAW
+            else:
+                row['losses'] += 1
+
+    def _sort(self) -> None:
+        ordered = sorted(
+            self.rows.values(),
+            key=lambda row: (
+                -row['points'],
+                -row['wins'],
+                -(row['goals_for'] - row['goals_against']),
+                -row['goals_for'],
+                row['official'],
+            ),
+        )
+        for position, row in enumerate(ordered, start=1):
+            row['position'] = position
+
+    def table(self) -> list[dict]:
+        """Return the ranking rows ordered by position."""
+        return [
+            {'position': row['position'], 'team': row['team'], 'id': row['id']}
+            for row in sorted(self.rows.values(), key=lambda row: row['position'])
+        ]
@@ -6,8 +6,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 
-from .const import DOMAIN
-from .coordinator import MyCoordinator
+from .const import DOMAIN, CHANNEL_LOGO
+from .coordinator import RbfaData
 from .entity import RbfaEntity
 
 import logging
@@ -28,21 +28,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up RBFA sensor based on a config entry."""
-    coordinator: MyCoordinator = hass.data[DOMAIN][entry.entry_id]
+    rbfa: RbfaData = hass.data[DOMAIN][entry.entry_id]
     team_id = entry.data.get('team')
-    
-    # Récupérer la langue depuis la config (data ou options)
-    language = entry.options.get('language') or entry.data.get('language', 'nl')
 
     # Créer les 7 entités
     entities = [
-        RbfaTeamSensor(coordinator, entry, team_id),
-        RbfaMatchInfoSensor(coordinator, entry, team_id, "upcoming", language),
-        RbfaMatchTeamSensor(coordinator, entry, team_id, "upcoming", "home", language),
-        RbfaMatchTeamSensor(coordinator, entry, team_id, "upcoming", "away", language),
-        RbfaMatchInfoSensor(coordinator, entry, team_id, "last", language),
-        RbfaMatchTeamSensor(coordinator, entry, team_id, "last", "home", language),
-        RbfaMatchTeamSensor(coordinator, entry, team_id, "last", "away", language),
+        RbfaTeamSensor(rbfa, entry, team_id),
+        RbfaMatchInfoSensor(rbfa, entry, team_id, "upcoming"),
+        RbfaMatchTeamSensor(rbfa, entry, team_id, "upcoming", "home"),
+        RbfaMatchTeamSensor(rbfa, entry, team_id, "upcoming", "away"),
+        RbfaMatchInfoSensor(rbfa, entry, team_id, "last"),
+        RbfaMatchTeamSensor(rbfa, entry, team_id, "last", "home"),
+        RbfaMatchTeamSensor(rbfa, entry, team_id, "last", "away"),
     ]
 
     async_add_entities(entities)
@@ -51,46 +48,49 @@ async def async_setup_entry(
 class RbfaTeamSensor(RbfaEntity, SensorEntity):
     """Représente l'équipe configurée (MyTeam)."""
 
+    _unrecorded_attributes = frozenset({'channel_logo'})
+
     def __init__(
         self,
-        coordinator: MyCoordinator,
+        rbfa: RbfaData,
         entry: ConfigEntry,
         team_id: str,
     ) -> None:
         """Initialize the team sensor."""
-        super().__init__(coordinator)
+        super().__init__(rbfa)
         self.team_id = team_id
-        
-        # Récupérer le nom alternatif depuis data ou options
-        alt_name = entry.options.get('alt_name') or entry.data.get('alt_name')
-        self._attr_name = alt_name if alt_name else f"Team {team_id}"
-        
         self._attr_unique_id = f"{DOMAIN}_myteam_{team_id}"
         self._attr_icon = "mdi:shield-account"
 
+    @property
+    def name(self) -> str:
+        """Return the alternative name from data or options."""
+        alt_name = self.rbfa.option('alt_name')
+        return alt_name if alt_name else f"Team {self.team_id}"
+
     @property
     def native_value(self) -> str | None:
         """Return the team name."""
-        return self._attr_name
+        return self.name
 
     @property
     def entity_picture(self) -> str | None:
         """Return the team logo."""
-        data = self.coordinator.data.get('upcoming') or self.coordinator.data.get('lastmatch')
+        data = self.rbfa.matchdata.get('upcoming') or self.rbfa.matchdata.get('lastmatch')
         if not data:
             return None
         
         # Détermine si c'est l'équipe à domicile ou extérieure
         if data.get('hometeamid') == self.team_id:
-            return data.get('hometeamlogo')
+            return self.rbfa.logo(data.get('hometeamlogo'), thumbnail=True)
         elif data.get('awayteamid') == self.team_id:
-            return data.get('awayteamlogo')
+            return self.rbfa.logo(data.get('awayteamlogo'), thumbnail=True)
         return None
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return team attributes."""
-        data = self.coordinator.data.get('upcoming') or self.coordinator.data.get('lastmatch')
+        data = self.rbfa.matchdata.get('upcoming') or self.rbfa.matchdata.get('lastmatch')
         
         attributes = {
             'team_id': self.team_id,
@@ -103,32 +103,36 @@ class RbfaTeamSensor(RbfaEntity, SensorEntity):
             # Channel logo
             if data.get('channel'):
                 attributes['channel'] = data.get('channel')
-                attributes['channel_logo'] = f"https://www.rbfa.be/assets/img/icons/organisers/Logo{data.get('channel').upper()}.svg"
+                attributes['channel_logo'] = self.rbfa.logo(CHANNEL_LOGO.format(data.get('channel').upper()))
         
         return attributes
 
 
 class RbfaMatchInfoSensor(RbfaEntity, SensorEntity):
-    """Représente les informations générales d'un match (arbitre, lieu, date)."""
+    """Représente les informations générales d'un match (arbitre, lieu, date).
+
+    Le classement complet n'est pas un attribut : il est disponible via
+    l'action rbfa.get_ranking et n'est donc pas stocké par le recorder.
+    """
+
+    _unrecorded_attributes = frozenset({'match_url', 'channel_logo'})
+    _layers = ('details',)
 
     def __init__(
         self,
-        coordinator: MyCoordinator,
+        rbfa: RbfaData,
         entry: ConfigEntry,
         team_id: str,
         match_type: str,
-        language: str = 'nl',
     ) -> None:
         """Initialize the match info sensor.
         
         Args:
             match_type: "last" pour dernier match, "upcoming" pour prochain match
-            language: Code langue pour l'URL (nl, fr, en)
         """
-        super().__init__(coordinator)
+        super().__init__(rbfa)
         self.team_id = team_id
         self.match_type = match_type
-        self.language = language
         
         # Déterminer la clé de données en fonction du type
         self._data_key = "lastmatch" if match_type == "last" else "upcoming"
@@ -151,7 +155,7 @@ class RbfaMatchInfoSensor(RbfaEntity, SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return match date and time."""
-        data = self.coordinator.data.get(self._data_key)
+        data = self.rbfa.matchdata.get(self._data_key)
         if not data:
             return "Aucun match"
         
@@ -164,7 +168,7 @@ class RbfaMatchInfoSensor(RbfaEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return match info attributes."""
-        data = self.coordinator.data.get(self._data_key)
+        data = self.rbfa.matchdata.get(self._data_key)
         if not data:
             return {
                 'match_type': self.match_type,
@@ -191,14 +195,10 @@ class RbfaMatchInfoSensor(RbfaEntity, SensorEntity):
             'match_url': self._get_match_url(match_id) if match_id else None,
         }
         
-        # Ajouter le classement si disponible
-        if data.get('ranking'):
-            attributes['classement'] = data.get('ranking')
-        
         # Ajouter le channel (ACFF/VV)
         if data.get('channel'):
             attributes['channel'] = data.get('channel')
-            attributes['channel_logo'] = f"https://www.rbfa.be/assets/img/icons/organisers/Logo{data.get('channel').upper()}.svg"
+            attributes['channel_logo'] = self.rbfa.logo(CHANNEL_LOGO.format(data.get('channel').upper()))
         
         return attributes
 
@@ -206,27 +206,27 @@ class RbfaMatchInfoSensor(RbfaEntity, SensorEntity):
 class RbfaMatchTeamSensor(RbfaEntity, SensorEntity):
     """Représente une équipe dans un match (domicile ou extérieur)."""
 
+    _unrecorded_attributes = frozenset({'logo'})
+    _layers = ('ranking',)
+
     def __init__(
         self,
-        coordinator: MyCoordinator,
+        rbfa: RbfaData,
         entry: ConfigEntry,
         team_id: str,
         match_type: str,
         side: str,
-        language: str = 'nl',
     ) -> None:
         """Initialize the match team sensor.
         
         Args:
             match_type: "last" pour dernier match, "upcoming" pour prochain match
             side: "home" pour domicile, "away" pour extérieur
-            language: Code langue pour l'URL (nl, fr, en)
         """
-        super().__init__(coordinator)
+        super().__init__(rbfa)
         self.team_id = team_id
         self.match_type = match_type
         self.side = side
-        self.language = language
         
         # Déterminer la clé de données en fonction du type
         self._data_key = "lastmatch" if match_type == "last" else "upcoming"
@@ -245,7 +245,7 @@ class RbfaMatchTeamSensor(RbfaEntity, SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return team name."""
-        data = self.coordinator.data.get(self._data_key)
+        data = self.rbfa.matchdata.get(self._data_key)
         if not data:
             return "Aucune équipe"
         
@@ -257,19 +257,19 @@ class RbfaMatchTeamSensor(RbfaEntity, SensorEntity):
     @property
     def entity_picture(self) -> str | None:
         """Return the team logo."""
-        data = self.coordinator.data.get(self._data_key)
+        data = self.rbfa.matchdata.get(self._data_key)
         if not data:
             return None
         
         if self.side == "home":
-            return data.get('hometeamlogo')
+            return self.rbfa.logo(data.get('hometeamlogo'), thumbnail=True)
         else:
-            return data.get('awayteamlogo')
+            return self.rbfa.logo(data.get('awayteamlogo'), thumbnail=True)
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return team attributes."""
-        data = self.coordinator.data.get(self._data_key)
+        data = self.rbfa.matchdata.get(self._data_key)
         if not data:
             return {
                 'match_type': self.match_type,
@@ -284,8 +284,9 @@ class RbfaMatchTeamSensor(RbfaEntity, SensorEntity):
             'side': self.side,
             'team_id': data.get(f'{prefix}id'),
             'team_name': data.get(prefix),
-            'logo': data.get(f'{prefix}logo'),
+            'logo': self.rbfa.logo(data.get(f'{prefix}logo')),
             'position': data.get(f'{prefix}position'),
+            'position_provisional': data.get('rankingprovisional'),
             'serie': data.get('series'),
         }
         
@@ -0,0 +1,55 @@
+"""Actions for the RBFA integration."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+SERVICE_GET_RANKING = 'get_ranking'
+
+GET_RANKING_SCHEMA = vol.Schema(
+    {
+        vol.Required('config_entry_id'): cv.string,
+        vol.Optional('match', default='upcoming'): vol.In(['upcoming', 'last']),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the RBFA actions."""
+
+    async def async_get_ranking(call: ServiceCall) -> ServiceResponse:
+        """Return the full ranking of the series of a match.
+
+        The ranking is returned as a response instead of an entity
+        attribute so it is never written to the state history.
+        """
+        rbfa = hass.data.get(DOMAIN, {}).get(call.data['config_entry_id'])
+        if rbfa is None:
+            raise ServiceValidationError(
+                f"RBFA entry {call.data['config_entry_id']} is not loaded"
+            )
+
+        data = rbfa.matchdata.get('lastmatch' if call.data['match'] == 'last' else 'upcoming')
+        if not data:
+            return {'match_id': None, 'series': None, 'series_id': None, 'ranking': []}
+
+        return {
+            'match_id': data['matchid'],
+            'series': data['series'],
+            'series_id': data['seriesid'],
+            'ranking': data['ranking'],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RANKING,
+        async_get_ranking,
+        schema=GET_RANKING_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
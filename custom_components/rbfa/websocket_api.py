@@ -0,0 +1,184 @@
+"""Websocket API for RBFA dashboards."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import RbfaData
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the RBFA websocket commands."""
+    websocket_api.async_register_command(hass, ws_calendar)
+    websocket_api.async_register_command(hass, ws_match)
+    websocket_api.async_register_command(hass, ws_ranking)
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+def _get_rbfa(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> RbfaData | None:
+    rbfa = hass.data.get(DOMAIN, {}).get(msg['entry_id'])
+    if rbfa is None:
+        connection.send_error(
+            msg['id'], websocket_api.ERR_NOT_FOUND, f"RBFA entry {msg['entry_id']} is not loaded"
+        )
+    return rbfa
+
+
+def _current_series(rbfa: RbfaData) -> str | None:
+    data = rbfa.matchdata.get('upcoming') or rbfa.matchdata.get('lastmatch')
+    return data['seriesid'] if data else None
+
+
+def _rank_key(row: dict) -> str:
+    return row['id']
+
+
+def _diff(old: dict[str, Any], new: dict[str, Any]) -> tuple[list, list]:
+    """Return the changed values and the removed keys between two mappings."""
+    changed = [value for key, value in new.items() if old.get(key) != value]
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required('type'): 'rbfa/calendar',
+        vol.Required('entry_id'): str,
+    }
+)
+@callback
+def ws_calendar(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the calendar of a team."""
+    if (rbfa := _get_rbfa(hass, connection, msg)) is None:
+        return
+    connection.send_result(msg['id'], {'calendar': rbfa.collections})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required('type'): 'rbfa/match',
+        vol.Required('entry_id'): str,
+        vol.Required('match_id'): str,
+    }
+)
+@callback
+def ws_match(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the details of a match of a team."""
+    if (rbfa := _get_rbfa(hass, connection, msg)) is None:
+        return
+    match = rbfa.matches.get(msg['match_id'])
+    if match is None:
+        connection.send_error(msg['id'], websocket_api.ERR_NOT_FOUND, 'Unknown match')
+        return
+    connection.send_result(msg['id'], {'match': match})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required('type'): 'rbfa/ranking',
+        vol.Required('entry_id'): str,
+        vol.Optional('series_id'): str,
+    }
+)
+@callback
+def ws_ranking(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the ranking of a series, by default the one of the next match."""
+    if (rbfa := _get_rbfa(hass, connection, msg)) is None:
+        return
+    series = msg.get('series_id') or _current_series(rbfa)
+    connection.send_result(
+        msg['id'], {'series_id': series, 'ranking': rbfa.rankings.get(series, [])}
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required('type'): 'rbfa/subscribe',
+        vol.Required('entry_id'): str,
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Push the changed matches and ranking rows after each update.
+
+    The first event holds the complete data, later events only what
+    changed since the previous one. The subscription ends with an error
+    when the entry is unloaded.
+    """
+    if (rbfa := _get_rbfa(hass, connection, msg)) is None:
+        return
+
+    matches: dict[str, dict] = {}
+    rankings: dict[str, dict[str, dict]] = {}
+
+    @callback
+    def async_send_changes() -> None:
+        nonlocal matches, rankings
+
+        changed, removed = _diff(matches, rbfa.matches)
+        event: dict[str, Any] = {}
+        if changed or removed:
+            event['matches'] = changed
+            event['removed_matches'] = removed
+
+        new_rankings = {
+            series: {_rank_key(row): row for row in rows}
+            for series, rows in rbfa.rankings.items()
+        }
+        ranking_changes = {}
+        ranking_removals = {}
+        for series in new_rankings.keys() | rankings.keys():
+            changed_rows, removed_rows = _diff(rankings.get(series, {}), new_rankings.get(series, {}))
+            if changed_rows:
+                ranking_changes[series] = changed_rows
+            if removed_rows:
+                ranking_removals[series] = removed_rows
+        if ranking_changes:
+            event['rankings'] = ranking_changes
+        if ranking_removals:
+            event['removed_rankings'] = ranking_removals
+
+        matches = dict(rbfa.matches)
+        rankings = new_rankings
+
+        if event:
+            connection.send_event(msg['id'], event)
+
+    remove_listener = rbfa.async_add_listener(
+        async_send_changes, [rbfa.calendar, rbfa.details, rbfa.ranking]
+    )
+
+    @callback
+    def async_unloaded() -> None:
+        remove_listener()
+        connection.subscriptions.pop(msg['id'], None)
+        connection.send_error(
+            msg['id'], websocket_api.ERR_NOT_FOUND, f"RBFA entry {msg['entry_id']} was unloaded"
+        )
+
+    remove_unloaded = rbfa.async_on_shutdown(async_unloaded)
+
+    @callback
+    def async_unsubscribe() -> None:
+        remove_listener()
+        remove_unloaded()
+
+    connection.subscriptions[msg['id']] = async_unsubscribe
+    connection.send_result(msg['id'])
+    async_send_changes()
@@ -0,0 +1,358 @@
+"""Load test harness for the RBFA integration.
+
+Starts N RBFA entries on a bare Home Assistant core against a local
+stub of the RBFA GraphQL endpoint and reports how the integration scales:
+
+- setup time of all entries (first refresh, run concurrently like HA does)
+- refresh cycle latency percentiles per entry
+- peak executor queue depth
+- event loop lag
+- resident memory
+- HTTP cache hits: the stub sends ETag and Cache-Control and answers
+  conditional requests with 304, its rankings lag one result behind the
+  calendar so the provisional standings are computed too
+
+Every entry count runs in its own process so memory figures are not
+polluted by previous runs. Requires a development environment with
+homeassistant and requests installed.
+
+Example:
+
+    python scripts/loadtest.py --entries 1 10 50 100 500 --output scaling.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_LOGGER = logging.getLogger('loadtest')
+
+
+class StubGraphQL(BaseHTTPRequestHandler):
+    """Answers the persisted queries used by TeamApp with generated data."""
+
+    matches = 10
+    latency = 0.0
+    max_age = 0
+    series_size = 12
+    base_url = ''
+    logo = b'<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"/>'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/logo/'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/svg+xml')
+            self.send_header('Content-Length', str(len(self.logo)))
+            self.end_headers()
+            self.wfile.write(self.logo)
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        operation = query['operationName'][0]
+        variables = json.loads(query['variables'][0])
+        value = next(v for k, v in variables.items() if k != 'language')
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        handler = getattr(self, '_' + operation, None)
+        if handler is None:
+            body = {'data': None, 'errors': [{'message': 'unknown operation'}]}
+        else:
+            body = {'data': handler(value)}
+
+        payload = json.dumps(body).encode()
+        etag = '"{}"'.format(hashlib.sha256(payload).hexdigest()[:16])
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', f'max-age={self.max_age}')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', f'max-age={self.max_age}')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _series(self, team):
+        return str(int(team) // self.series_size)
+
+    def _GetTeam(self, team):
+        return {'team': {'id': team, 'name': f'Team {team}', 'clubName': f'Club {team}'}}
+
+    def _GetTeamCalendar(self, team):
+        now = datetime.now().replace(microsecond=0, second=0)
+        series = self._series(team)
+        calendar = []
+        for i in range(self.matches):
+            start = now + timedelta(days=7 * (i - self.matches // 2))
+            played = start < now
+            calendar.append({
+                'id': f'{team}{i:03d}',
+                'channel': 'vv',
+                'startTime': start.strftime('%Y-%m-%dT%H:%M:%S'),
+                'state': 'finished' if played else 'planned',
+                'homeTeam': {'id': team, 'name': f'Team {team}', 'logo': f'{self.base_url}/logo/{team}.svg'},
+                'awayTeam': {'id': f'{i}', 'name': f'Opponent {i}', 'logo': f'{self.base_url}/logo/o{i}.svg'},
+                'outcome': {
+                    'homeTeamGoals': 2 if played else None,
+                    'homeTeamPenaltiesScored': None,
+                    'awayTeamGoals': 1 if played else None,
+                    'awayTeamPenaltiesScored': None,
+                },
+                'series': {'id': series, 'name': f'Series {series}'},
+            })
+        return {'teamCalendar': calendar}
+
+    def _GetMatchDetail(self, match):
+        return {'matchDetail': {
+            'location': {'address': 'Stadionstraat 1', 'postalCode': '1000', 'city': 'Brussel'},
+            'officials': [{'function': 'referee', 'firstName': 'Ref', 'lastName': match}],
+        }}
+
+    def _GetSeriesRankings(self, series):
+        # One result behind the calendar, so every team has provisional standings.
+        first = int(series) * self.series_size
+        played = max(0, self.matches // 2 - 1)
+        teams = []
+        for i in range(self.series_size):
+            wins = max(0, played - i)
+            losses = played - wins
+            teams.append({
+                'position': i + 1,
+                'name': f'Team {first + i}',
+                'teamId': str(first + i),
+                'matchesPlayed': played,
+                'points': 3 * wins,
+                'wins': wins,
+                'draws': 0,
+                'losses': losses,
+                'goalsScored': 2 * wins + losses,
+                'goalsConceded': wins + 2 * losses,
+            })
+        return {'seriesRankings': {'rankings': [{'teams': teams}]}}
+
+
+def start_stub(matches, latency, max_age):
+    StubGraphQL.matches = matches
+    StubGraphQL.latency = latency
+    StubGraphQL.max_age = max_age
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGraphQL)
+    server.daemon_threads = True
+    StubGraphQL.base_url = 'http://{}:{}'.format(*server.server_address)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def rounded(value, scale=1, digits=3):
+    """Round a measurement, None when nothing was measured."""
+    return None if value is None else round(value * scale, digits)
+
+
+class Monitor:
+    """Samples event loop lag, executor queue depth and memory."""
+
+    def __init__(self, loop, executor, interval=0.05):
+        self.loop = loop
+        self.executor = executor
+        self.interval = interval
+        self.lag = []
+        self.queue_peak = 0
+        self.rss_peak = 0.0
+        self._task = None
+
+    def start(self):
+        self._task = self.loop.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        while True:
+            start = self.loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag.append(max(0.0, self.loop.time() - start - self.interval))
+            self.queue_peak = max(self.queue_peak, self.executor._work_queue.qsize())
+            self.rss_peak = max(self.rss_peak, rss_mb())
+
+
+async def timed_refresh(rbfa):
+    start = time.perf_counter()
+    await rbfa.async_refresh()
+    return time.perf_counter() - start
+
+
+async def run_single(args):
+    from homeassistant.core import HomeAssistant
+    from custom_components.rbfa.rbfa_core import client
+    from custom_components.rbfa.coordinator import RbfaData
+
+    server = start_stub(args.matches, args.latency / 1000, args.max_age)
+    client.API_URL = StubGraphQL.base_url + '/graphql'
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    loop.set_default_executor(executor)
+
+    hass = HomeAssistant(str(ROOT / '.loadtest'))
+    await hass.async_start()
+    rss_start = rss_mb()
+
+    monitor = Monitor(loop, executor)
+    monitor.start()
+
+    start = time.perf_counter()
+    teams = []
+    for i in range(args.single):
+        entry = SimpleNamespace(
+            entry_id=f'loadtest_{i}',
+            data={'team': str(100000 + i), 'duration': 105, 'show_ranking': True, 'show_referee': True},
+            options={},
+        )
+        teams.append(RbfaData(hass, entry))
+    await asyncio.gather(*(c.async_refresh() for c in teams))
+    setup_time = time.perf_counter() - start
+    failed = sum(1 for c in teams if not all(layer.last_update_success for layer in c.layers))
+
+    latencies = []
+    for _ in range(args.cycles):
+        latencies.extend(await asyncio.gather(*(timed_refresh(c) for c in teams)))
+
+    await monitor.stop()
+    http_stats = client.RESPONSE_CACHE.snapshot()
+    for c in teams:
+        await c.async_shutdown()
+    await hass.async_stop()
+    server.shutdown()
+    executor.shutdown(wait=False)
+
+    return {
+        'entries': args.single,
+        'matches_per_team': args.matches,
+        'stub_latency_ms': args.latency,
+        'executor_workers': args.workers,
+        'failed_entries': failed,
+        'setup_s': round(setup_time, 3),
+        'refresh_p50_s': rounded(percentile(latencies, 50)),
+        'refresh_p95_s': rounded(percentile(latencies, 95)),
+        'refresh_p99_s': rounded(percentile(latencies, 99)),
+        'refresh_max_s': rounded(max(latencies, default=None)),
+        'executor_queue_peak': monitor.queue_peak,
+        'loop_lag_p95_ms': rounded(percentile(monitor.lag, 95), 1000, 1),
+        'loop_lag_max_ms': rounded(max(monitor.lag, default=None), 1000, 1),
+        'rss_start_mb': round(rss_start, 1),
+        'rss_peak_mb': round(monitor.rss_peak, 1),
+        'rss_per_entry_kb': round((monitor.rss_peak - rss_start) * 1024 / args.single, 1),
+        'http_requests': sum(stats['requests'] for stats in http_stats.values()),
+        'http_not_modified': sum(stats['not_modified'] for stats in http_stats.values()),
+    }
+
+
+def run_sweep(args):
+    results = []
+    for entries in args.entries:
+        command = [
+            sys.executable, __file__,
+            '--single', str(entries),
+            '--matches', str(args.matches),
+            '--latency', str(args.latency),
+            '--cycles', str(args.cycles),
+            '--max-age', str(args.max_age),
+            '--workers', str(args.workers),
+        ]
+        _LOGGER.info('running %d entries', entries)
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+    return results
+
+
+def print_table(results):
+    columns = [
+        'entries', 'setup_s', 'refresh_p50_s', 'refresh_p95_s', 'refresh_p99_s',
+        'executor_queue_peak', 'loop_lag_p95_ms', 'loop_lag_max_ms', 'rss_peak_mb', 'rss_per_entry_kb',
+        'http_requests', 'http_not_modified',
+    ]
+    widths = [max(len(c), 8) for c in columns]
+    print('  '.join(c.rjust(w) for c, w in zip(columns, widths)))
+    for result in results:
+        print('  '.join(str(result[c]).rjust(w) for c, w in zip(columns, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, nargs='+', default=[1, 10, 50, 100, 500],
+                        help='entry counts to measure (1-500)')
+    parser.add_argument('--matches', type=int, default=10, help='matches per team calendar')
+    parser.add_argument('--latency', type=float, default=50, help='stub response latency in ms')
+    parser.add_argument('--cycles', type=int, default=3, help='refresh cycles after setup')
+    parser.add_argument('--max-age', type=int, default=0,
+                        help='Cache-Control max-age of the stub responses, 0 revalidates every request')
+    parser.add_argument('--workers', type=int, default=64, help='executor workers, HA uses 64')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    if args.single:
+        logging.getLogger('custom_components.rbfa').setLevel(logging.WARNING)
+        print(json.dumps(asyncio.run(run_single(args))))
+        return
+
+    if any(not 1 <= n <= 500 for n in args.entries):
+        parser.error('--entries must be between 1 and 500')
+
+    results = run_sweep(args)
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
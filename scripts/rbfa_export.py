@@ -0,0 +1,27 @@
+"""Run the rbfa_core export CLI without Home Assistant.
+
+rbfa_core lives inside the integration, whose modules (calendar.py)
+would shadow the standard library if custom_components/rbfa were put on
+sys.path. This launcher loads the package from its location instead.
+
+Example:
+
+    python scripts/rbfa_export.py --club 2438 --team 300872 --format json ics --output export
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+CORE = Path(__file__).resolve().parent.parent / 'custom_components' / 'rbfa' / 'rbfa_core'
+
+spec = importlib.util.spec_from_file_location(
+    'rbfa_core', CORE / '__init__.py', submodule_search_locations=[str(CORE)]
+)
+module = importlib.util.module_from_spec(spec)
+sys.modules['rbfa_core'] = module
+spec.loader.exec_module(module)
+
+from rbfa_core.__main__ import main  # noqa: E402
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""Load rbfa_core without Home Assistant, like scripts/rbfa_export.py.
+
+custom_components/rbfa cannot be put on sys.path because its calendar.py
+would shadow the standard library, so the package is loaded from its
+location instead.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+CORE = Path(__file__).resolve().parent.parent / 'custom_components' / 'rbfa' / 'rbfa_core'
+
+if 'rbfa_core' not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        'rbfa_core', CORE / '__init__.py', submodule_search_locations=[str(CORE)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['rbfa_core'] = module
+    spec.loader.exec_module(module)
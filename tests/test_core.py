@@ -0,0 +1,194 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from rbfa_core.client import RbfaClient, RbfaConnectionError, ResponseCache
+from rbfa_core.export import _escape, _fold, to_ics
+from rbfa_core.normalize import normalize
+from rbfa_core.standings import SeriesStandings
+
+TZ = ZoneInfo('Europe/Brussels')
+TEAM = '1'
+
+
+def match(match_id, start, home='1', away='2', home_goals=None, away_goals=None, series='s1'):
+    return {
+        'id': match_id,
+        'channel': 'vv',
+        'startTime': start,
+        'state': 'finished' if home_goals is not None else 'planned',
+        'homeTeam': {'id': home, 'name': f'Team {home}', 'logo': None},
+        'awayTeam': {'id': away, 'name': f'Team {away}', 'logo': None},
+        'outcome': {
+            'homeTeamGoals': home_goals,
+            'homeTeamPenaltiesScored': None,
+            'awayTeamGoals': away_goals,
+            'awayTeamPenaltiesScored': None,
+        },
+        'series': {'id': series, 'name': f'Series {series}'},
+    }
+
+
+CALENDAR = [
+    match('m1', '2024-10-05T15:00:00', home_goals=2, away_goals=1),
+    match('m2', '2024-10-12T15:00:00', home='3', away='1'),
+    match('m3', '2024-10-19T15:00:00'),
+]
+
+
+def selected(now):
+    result = normalize(TEAM, CALENDAR, {}, {}, now)['matchdata']
+    return [result[tag] and result[tag]['matchid'] for tag in ('upcoming', 'lastmatch')]
+
+
+def test_next_match_is_the_first_not_ended():
+    assert selected(datetime(2024, 10, 10, tzinfo=TZ)) == ['m2', 'm1']
+
+
+def test_match_in_progress_is_still_upcoming():
+    assert selected(datetime(2024, 10, 12, 16, 30, tzinfo=TZ)) == ['m2', 'm1']
+    assert selected(datetime(2024, 10, 12, 16, 46, tzinfo=TZ)) == ['m3', 'm2']
+
+
+def test_no_last_match_before_the_season():
+    assert selected(datetime(2024, 9, 1, tzinfo=TZ)) == ['m1', None]
+
+
+def test_last_match_after_the_season():
+    assert selected(datetime(2024, 11, 1, tzinfo=TZ)) == [None, 'm3']
+
+
+def test_ranking_positions_are_set_on_next_and_last_match():
+    teams = [
+        {'teamId': '3', 'name': 'Team 3', 'position': 1},
+        {'teamId': '2', 'name': 'Team 2', 'position': 2},
+        {'teamId': '1', 'name': 'Team 1', 'position': 3},
+    ]
+    standings = {'s1': SeriesStandings(teams, TEAM)}
+    result = normalize(TEAM, CALENDAR, {}, standings, datetime(2024, 10, 10, tzinfo=TZ))
+    upcoming = result['matchdata']['upcoming']
+    assert (upcoming['hometeamposition'], upcoming['awayteamposition']) == (1, 3)
+    assert result['rankings']['s1'][0]['id'] == '3'
+    assert upcoming['ranking'] == result['rankings']['s1']
+    assert result['matches']['m2']['ranking'] == []
+    assert result['matches']['m2']['hometeamposition'] is None
+
+    result = normalize(TEAM, CALENDAR, {}, standings, datetime(2024, 10, 10, tzinfo=TZ), show_ranking=False)
+    assert result['rankings'] == {}
+    assert result['matchdata']['upcoming']['hometeamposition'] is None
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('max-age=60', 60),
+    ('public, Max-Age=30', 30),
+    ('no-cache, max-age=60', 0),
+    ('no-store, max-age=60', None),
+    ('max-age=-5', 0),
+    ('max-age=soon', 0),
+    ('', 0),
+])
+def test_max_age(header, expected):
+    assert ResponseCache._max_age(SimpleNamespace(headers={'Cache-Control': header})) == expected
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, body=b''):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers):
+        self.sent.append(headers)
+        return self.responses.pop(0)
+
+
+def test_not_modified_updates_the_validators():
+    body = json.dumps({'data': {'team': {'id': TEAM}}}).encode()
+    session = FakeSession([
+        FakeResponse(200, {'ETag': '"a"', 'Cache-Control': 'no-cache'}, body),
+        FakeResponse(304, {'ETag': '"b"'}),
+        FakeResponse(304),
+    ])
+    cache = ResponseCache()
+    for _ in range(3):
+        assert cache.get(session, 'GetTeam', 'url') == {'data': {'team': {'id': TEAM}}}
+
+    assert 'If-None-Match' not in session.sent[0]
+    assert session.sent[1]['If-None-Match'] == '"a"'
+    assert session.sent[2]['If-None-Match'] == '"b"'
+    stats = cache.stats['GetTeam']
+    assert (stats['downloaded'], stats['not_modified'], stats['cache_saved']) == (1, 2, 2 * len(body))
+    assert cache.format_stats() == [
+        f'GetTeam: 3 requests, 0 fresh, 2 not modified, 1 downloaded, {len(body)} bytes received, '
+        f'0 bytes saved by compression, {2 * len(body)} bytes saved by the cache'
+    ]
+
+
+def test_fresh_response_is_not_requested_again():
+    body = b'{"data": {}}'
+    session = FakeSession([FakeResponse(200, {'Cache-Control': 'max-age=60', 'Content-Length': '5'}, body)])
+    cache = ResponseCache()
+    cache.get(session, 'GetTeam', 'url')
+    cache.get(session, 'GetTeam', 'url')
+    assert len(session.sent) == 1
+    stats = cache.stats['GetTeam']
+    assert (stats['fresh'], stats['compression_saved'], stats['cache_saved']) == (1, len(body) - 5, len(body))
+
+
+def test_client_raises_connection_errors():
+    client = RbfaClient(cache=ResponseCache(), api_url='http://127.0.0.1:9/graphql')
+    try:
+        with pytest.raises(RbfaConnectionError):
+            asyncio.run(client.get_team(TEAM))
+    finally:
+        client.close()
+
+
+def test_escape():
+    assert _escape('a;b,c\\d\ne') == 'a\\;b\\,c\\\\d\\ne'
+    assert _escape(None) == ''
+
+
+@pytest.mark.parametrize('line', ['x' * 200, 'DESCRIPTION:' + 'é' * 80, 'short'])
+def test_fold(line):
+    folded = _fold(line)
+    assert all(len(part.encode()) <= 75 for part in folded.split('\r\n'))
+    assert folded.replace('\r\n ', '') == line
+
+
+def test_to_ics():
+    start = datetime(2024, 10, 12, 15, 0, tzinfo=TZ)
+    export = {
+        'id': TEAM,
+        'team': {'clubName': 'Club', 'name': 'U13'},
+        'collections': [{
+            'uid': 'm1',
+            'starttime': start,
+            'endtime': start + timedelta(minutes=105),
+            'summary': 'Team 1 - Team 2',
+            'location': None,
+            'description': 'Series s1; Goals: 2 - 1',
+        }],
+    }
+    ics = to_ics(export, now=datetime(2024, 10, 1, tzinfo=timezone.utc))
+    lines = ics.split('\r\n')
+    assert ics.endswith('END:VCALENDAR\r\n')
+    assert 'X-WR-CALNAME:Club | U13' in lines
+    assert 'DTSTART:20241012T130000Z' in lines
+    assert 'DTEND:20241012T144500Z' in lines
+    assert 'DESCRIPTION:Series s1\\; Goals: 2 - 1' in lines
+    assert not any(line.startswith('LOCATION:') for line in lines)
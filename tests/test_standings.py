@@ -0,0 +1,153 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from rbfa_core.standings import SeriesStandings, finished_matches
+
+SERIES = 's1'
+TEAM = '1'
+
+
+def rank(team_id, position, played, points, wins, draws, losses, goals_for, goals_against):
+    return {
+        'teamId': team_id,
+        'name': f'Team {team_id}',
+        'position': position,
+        'matchesPlayed': played,
+        'points': points,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'goalsScored': goals_for,
+        'goalsConceded': goals_against,
+    }
+
+
+def match(match_id, day, home, away, home_goals=None, away_goals=None, series=SERIES):
+    return {
+        'id': match_id,
+        'startTime': f'2024-10-{day:02d}T15:00:00',
+        'state': 'finished' if home_goals is not None else 'planned',
+        'homeTeam': {'id': home},
+        'awayTeam': {'id': away},
+        'outcome': {'homeTeamGoals': home_goals, 'awayTeamGoals': away_goals},
+        'series': {'id': series},
+    }
+
+
+def official():
+    return [
+        rank('2', 1, 5, 13, 4, 1, 0, 10, 2),
+        rank(TEAM, 2, 4, 10, 3, 1, 0, 8, 4),
+        rank('3', 3, 5, 0, 0, 0, 5, 1, 15),
+    ]
+
+
+def counted():
+    """The four results of the team the official ranking already counts."""
+    return [
+        match('m1', 1, TEAM, '9', 2, 1),
+        match('m2', 2, '9', TEAM, 1, 1),
+        match('m3', 3, TEAM, '9', 3, 1),
+        match('m4', 4, '9', TEAM, 1, 2),
+    ]
+
+
+def positions(standings):
+    return [row['id'] for row in standings.table()]
+
+
+def test_finished_matches_of_series_oldest_first():
+    calendar = [
+        match('b', 8, TEAM, '2', 1, 0),
+        match('a', 1, TEAM, '3', 0, 0),
+        match('c', 15, TEAM, '2'),
+        match('d', 2, TEAM, '2', 1, 1, series='s2'),
+    ]
+    assert [item['id'] for item in finished_matches(calendar, SERIES)] == ['a', 'b']
+
+
+def test_counted_results_keep_the_official_table():
+    standings = SeriesStandings(official(), TEAM)
+    assert standings.enabled
+    assert not standings.update(counted() + [match('m5', 11, TEAM, '3')], SERIES)
+    assert not standings.provisional
+    assert positions(standings) == ['2', TEAM, '3']
+
+
+def test_new_result_is_applied():
+    standings = SeriesStandings(official(), TEAM)
+    assert standings.update(counted() + [match('m5', 11, TEAM, '3', 5, 0)], SERIES)
+    assert standings.provisional
+    assert standings.applied == {'m5'}
+    assert positions(standings) == [TEAM, '2', '3']
+    assert standings.rows[TEAM]['points'] == 13
+    assert standings.rows['3']['losses'] == 6
+
+
+def test_tie_on_points_and_wins_goes_to_goal_difference():
+    standings = SeriesStandings(official(), TEAM)
+    standings.update(counted() + [match('m5', 11, TEAM, '3', 1, 0)], SERIES)
+    assert positions(standings) == ['2', TEAM, '3']
+
+
+def test_tie_on_goal_difference_goes_to_goals_scored():
+    standings = SeriesStandings(official(), TEAM)
+    standings.update(counted() + [match('m5', 11, TEAM, '3', 4, 0)], SERIES)
+    assert standings.rows[TEAM]['goals_for'] - standings.rows[TEAM]['goals_against'] == 8
+    assert positions(standings) == [TEAM, '2', '3']
+
+
+def test_full_tie_keeps_the_official_order():
+    teams = [
+        rank('2', 1, 1, 3, 1, 0, 0, 1, 0),
+        rank(TEAM, 2, 0, 0, 0, 0, 0, 0, 0),
+        rank('3', 3, 1, 0, 0, 0, 1, 0, 1),
+    ]
+    standings = SeriesStandings(teams, TEAM)
+    standings.update([match('m1', 1, TEAM, '4', 1, 0)], SERIES)
+    assert positions(standings) == ['2', TEAM, '3']
+
+
+def test_live_score_is_replaced_by_the_next_calendar():
+    standings = SeriesStandings(official(), TEAM)
+    assert standings.update(counted() + [match('m5', 11, '3', TEAM, 1, 0)], SERIES)
+    assert standings.rows['3']['points'] == 3
+
+    standings.update(counted() + [match('m5', 11, '3', TEAM, 1, 3)], SERIES)
+    assert standings.rows['3']['points'] == 0
+    assert standings.rows[TEAM]['points'] == 13
+    assert standings.rows[TEAM]['played'] == 5
+
+    assert standings.update(counted() + [match('m5', 11, '3', TEAM)], SERIES)
+    assert not standings.provisional
+    assert standings.rows['3']['points'] == 0
+    assert standings.rows[TEAM]['points'] == 10
+    assert positions(standings) == ['2', TEAM, '3']
+
+
+def test_match_in_progress_is_left_out():
+    standings = SeriesStandings(official(), TEAM)
+    calendar = counted() + [match('m5', 11, TEAM, '3', 1, 0)]
+    during = datetime(2024, 10, 11, 16, 0, tzinfo=ZoneInfo('Europe/Brussels'))
+    assert not standings.update(calendar, SERIES, during, duration=105)
+    assert not standings.provisional
+
+    after = datetime(2024, 10, 11, 16, 45, tzinfo=ZoneInfo('Europe/Brussels'))
+    assert standings.update(calendar, SERIES, after, duration=105)
+    assert standings.applied == {'m5'}
+
+
+def test_same_calendar_twice_is_no_change():
+    standings = SeriesStandings(official(), TEAM)
+    calendar = counted() + [match('m5', 11, TEAM, '3', 5, 0)]
+    assert standings.update(calendar, SERIES)
+    assert not standings.update(calendar, SERIES)
+    assert standings.rows[TEAM]['points'] == 13
+
+
+def test_ranking_without_points_is_disabled():
+    teams = [{'teamId': row['teamId'], 'name': row['name'], 'position': row['position']} for row in official()]
+    standings = SeriesStandings(teams, TEAM)
+    assert not standings.enabled
+    assert not standings.update(counted() + [match('m5', 11, TEAM, '3', 5, 0)], SERIES)
+    assert positions(standings) == ['2', TEAM, '3']